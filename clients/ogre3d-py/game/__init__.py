@@ -2,21 +2,81 @@
 Game state management
 """
 
+import heapq
 import threading
 import time
-import math
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Set
+from collections import deque
+from dataclasses import dataclass, field, fields
+from typing import Deque, Dict, List, Optional, Set, Tuple
 import json
 
-
-@dataclass
+import numpy as np
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from scipy.spatial import cKDTree
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+# Input bitmask flags (one bit per held action in input_mask)
+INPUT_FORWARD = 1 << 0
+INPUT_BACKWARD = 1 << 1
+INPUT_LEFT = 1 << 2
+INPUT_RIGHT = 1 << 3
+INPUT_JUMP = 1 << 4
+INPUT_CROUCH = 1 << 5
+INPUT_RUN = 1 << 6
+
+# The low bits steer movement and index the direction table
+INPUT_COMBINATIONS = 1 << 5
+INPUT_MOVEMENT_MASK = INPUT_COMBINATIONS - 1
+
+# Action names with an input_mask bit
+INPUT_ACTIONS = {
+    'forward': INPUT_FORWARD,
+    'backward': INPUT_BACKWARD,
+    'left': INPUT_LEFT,
+    'right': INPUT_RIGHT,
+    'jump': INPUT_JUMP,
+    'crouch': INPUT_CROUCH,
+    'run': INPUT_RUN
+}
+
+# Compact entity type codes kept in EntityPool.type_codes (0 = other)
+ENTITY_TYPE_CODES = {'player': 1, 'npc': 2, 'mob': 3, 'item': 4}
+ENTITY_TYPE_PLAYER = ENTITY_TYPE_CODES['player']
+
+GRAVITY = 9.8  # meters per second squared
+UPDATE_RATE_SMOOTHING = 0.05  # EMA weight of the newest frame time
+CHUNK_TTL_NS = 60_000_000_000  # unload chunks idle for 60 seconds
+
+
+@dataclass(slots=True)
 class PlayerState:
     """Player state data"""
     player_id: int = 0
-    position: List[float] = field(default_factory=lambda: [0.0, 0.0, 0.0])
+    position: np.ndarray = field(default_factory=lambda: np.zeros(3))
     rotation: List[float] = field(default_factory=lambda: [0.0, 0.0, 0.0, 1.0])
-    velocity: List[float] = field(default_factory=lambda: [0.0, 0.0, 0.0])
+    velocity: np.ndarray = field(default_factory=lambda: np.zeros(3))
     health: int = 100
     max_health: int = 100
     mana: int = 100
@@ -27,15 +87,20 @@ class PlayerState:
     equipment: Dict = field(default_factory=dict)
     skills: Dict = field(default_factory=dict)
 
+    def __post_init__(self):
+        # Movement kernel works on contiguous float64 vectors
+        self.position = np.array(self.position[:3], dtype=np.float64)
+        self.velocity = np.array(self.velocity[:3], dtype=np.float64)
+
 
-@dataclass
+@dataclass(slots=True)
 class EntityState:
     """Entity state data"""
     entity_id: int
     entity_type: str
-    position: List[float]
+    position: List[float]  # bound to an EntityPool row once registered
     rotation: List[float]
-    velocity: List[float]
+    velocity: List[float]  # bound to an EntityPool row once registered
     health: int = 100
     max_health: int = 100
     mesh_name: str = ""
@@ -45,7 +110,7 @@ class EntityState:
     data: Dict = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class WorldChunk:
     """World chunk data"""
     chunk_x: int
@@ -53,7 +118,167 @@ class WorldChunk:
     terrain_data: List[List[float]]
     entities: List[EntityState]
     loaded: bool = False
-    last_accessed: float = field(default_factory=time.time)
+    last_accessed: int = field(default_factory=time.monotonic_ns)
+
+
+def pack_chunk_key(chunk_x, chunk_z):
+    """Pack signed 32-bit chunk coordinates into one int dict key"""
+    return ((chunk_x & 0xFFFFFFFF) << 32) | (chunk_z & 0xFFFFFFFF)
+
+
+def unpack_chunk_key(chunk_key):
+    """Recover (chunk_x, chunk_z) from a pack_chunk_key key"""
+    chunk_x = chunk_key >> 32
+    chunk_z = chunk_key & 0xFFFFFFFF
+    if chunk_x & 0x80000000:
+        chunk_x -= 1 << 32
+    if chunk_z & 0x80000000:
+        chunk_z -= 1 << 32
+    return chunk_x, chunk_z
+
+
+def _build_direction_table():
+    """Precompute the movement direction for every input bitmask"""
+    table = np.zeros((INPUT_COMBINATIONS, 3), dtype=np.float64)
+    for bits in range(INPUT_COMBINATIONS):
+        table[bits, 0] = bool(bits & INPUT_RIGHT) - bool(bits & INPUT_LEFT)
+        table[bits, 1] = bool(bits & INPUT_JUMP)
+        table[bits, 2] = bool(bits & INPUT_BACKWARD) - bool(bits & INPUT_FORWARD)
+    return table
+
+
+_DIR_TABLE = _build_direction_table()
+
+
+@njit(cache=True)
+def _step_player(position, velocity, input_bits, dt, move_speed):
+    """Advance player position in place for one frame"""
+    step = move_speed * dt
+    direction = _DIR_TABLE[input_bits]
+
+    # Apply movement to player position
+    for i in range(3):
+        velocity[i] = direction[i] * step
+        position[i] += velocity[i]
+
+    # Apply gravity
+    if position[1] > 0:
+        position[1] -= GRAVITY * dt
+
+    # Clamp to ground
+    if position[1] < 0:
+        position[1] = 0.0
+
+
+class EntityPool:
+    """Structure-of-arrays storage for entity positions and velocities
+
+    Each registered entity owns a dense slot; its ``position`` and
+    ``velocity`` attributes are NumPy views into the pool rows so distance
+    queries and interpolation can run over contiguous float32 arrays.
+    Velocities are only copied in from server data, so they are stored
+    quantized as float16. ``type_codes`` holds each slot's entity type
+    as an ``ENTITY_TYPE_CODES`` value for vectorized filtering.
+    """
+
+    POSITION_DTYPE = np.float32
+    VELOCITY_DTYPE = np.float16
+
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.count = 0
+        self.positions = np.zeros((capacity, 3), dtype=self.POSITION_DTYPE)
+        self.velocities = np.zeros((capacity, 3), dtype=self.VELOCITY_DTYPE)
+        self.type_codes = np.zeros(capacity, dtype=np.uint8)
+        self.entities: List[Optional[EntityState]] = [None] * capacity
+        self.slots: Dict[int, int] = {}
+
+    def allocate(self, entity):
+        """Assign a slot to an entity and bind its array views"""
+        if entity.entity_id in self.slots:
+            self.release(entity.entity_id)
+
+        if self.count == self.capacity:
+            self._grow()
+
+        slot = self.count
+        self.count += 1
+
+        self.positions[slot] = entity.position[:3]
+        self.velocities[slot] = entity.velocity[:3]
+        self.type_codes[slot] = ENTITY_TYPE_CODES.get(entity.entity_type, 0)
+        self.entities[slot] = entity
+        self.slots[entity.entity_id] = slot
+        self._bind(slot)
+
+        return slot
+
+    def release(self, entity_id):
+        """Free an entity slot, moving the last entity into the gap"""
+        slot = self.slots.pop(entity_id, None)
+        if slot is None:
+            return
+
+        # Detach the released entity from the pool storage
+        entity = self.entities[slot]
+        entity.position = self.positions[slot].copy()
+        entity.velocity = self.velocities[slot].copy()
+
+        last = self.count - 1
+        if slot != last:
+            self.positions[slot] = self.positions[last]
+            self.velocities[slot] = self.velocities[last]
+            self.type_codes[slot] = self.type_codes[last]
+            moved = self.entities[last]
+            self.entities[slot] = moved
+            self.slots[moved.entity_id] = slot
+            self._bind(slot)
+
+        self.entities[last] = None
+        self.count = last
+
+    def clear(self):
+        """Release all slots"""
+        for entity_id in list(self.slots):
+            self.release(entity_id)
+
+    def _bind(self, slot):
+        """Point an entity's attributes at its pool rows"""
+        entity = self.entities[slot]
+        entity.position = self.positions[slot]
+        entity.velocity = self.velocities[slot]
+
+    def _grow(self):
+        """Double pool capacity and rebind existing views"""
+        self.capacity *= 2
+
+        positions = np.zeros((self.capacity, 3), dtype=self.POSITION_DTYPE)
+        velocities = np.zeros((self.capacity, 3), dtype=self.VELOCITY_DTYPE)
+        positions[:self.count] = self.positions[:self.count]
+        velocities[:self.count] = self.velocities[:self.count]
+        type_codes = np.zeros(self.capacity, dtype=np.uint8)
+        type_codes[:self.count] = self.type_codes[:self.count]
+        self.positions = positions
+        self.velocities = velocities
+        self.type_codes = type_codes
+        self.entities.extend([None] * (self.capacity - len(self.entities)))
+
+        for slot in range(self.count):
+            self._bind(slot)
+
+
+def _fields_dict(obj):
+    """Shallow field mapping for a slotted dataclass instance"""
+    return {f.name: getattr(obj, f.name) for f in fields(obj)}
+
+
+def _json_default(value):
+    """Convert NumPy values for JSON serialization"""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
 
 
 class GameStateManager:
@@ -67,9 +292,16 @@ class GameStateManager:
 
         # Entities (excluding player)
         self.entities: Dict[int, EntityState] = {}
+        self.entity_pool = EntityPool()
+
+        # Spatial index over entity positions (rebuilt lazily when dirty)
+        self._spatial_tree = None
+        self._spatial_dirty = True
 
         # World chunks
-        self.chunks: Dict[str, WorldChunk] = {}
+        self.chunks: Dict[int, WorldChunk] = {}  # keyed by pack_chunk_key
+        # Min-heap of (expiry_ns, chunk_key); entries go stale when a chunk is touched again
+        self._chunk_expiry: List[Tuple[int, int]] = []
 
         # Game world data
         self.world_size = 10000  # meters
@@ -88,28 +320,47 @@ class GameStateManager:
         self.quests: List[Dict] = []
         self.active_quests: List[Dict] = []
 
-        # Chat
-        self.chat_messages: List[Dict] = []
-
-        # Network stats
-        self.last_update_time = time.time()
-        self.update_rate = 0.0
-
-        # Input state
-        self.input_state = {
-            'forward': False,
-            'backward': False,
-            'left': False,
-            'right': False,
-            'jump': False,
-            'crouch': False,
-            'run': False
-        }
+        # Change counters for UI refreshes (bump after mutating the data)
+        self.entities_version = 0
+        self.quests_version = 0
+        self.party_version = 0
+
+        # Chat (keeps only the last 1000 messages)
+        self.chat_messages: Deque[Dict] = deque(maxlen=1000)
+
+        # Network stats (update rate derived lazily from smoothed frame time)
+        self._dt_ema = 0.0
+
+        # Input state (INPUT_* flags of held actions)
+        self.input_mask = 0
 
         # Camera state
         self.camera_position = [0.0, 0.0, 0.0]
         self.camera_rotation = [0.0, 0.0, 0.0, 1.0]
 
+        # Player values published for UI reads (see _publish_player_snapshot)
+        self._publish_player_snapshot()
+
+        # Double-buffered entity arrays published for UI reads
+        # (see _publish_entity_snapshot)
+        self._entity_buffers = [
+            (np.zeros((0, 3), dtype=EntityPool.POSITION_DTYPE), np.zeros(0, dtype=np.uint8)),
+            (np.zeros((0, 3), dtype=EntityPool.POSITION_DTYPE), np.zeros(0, dtype=np.uint8))
+        ]
+        self._entity_buffer_index = 0
+        self._entity_snapshot = (-1, self._entity_buffers[0][0], self._entity_buffers[0][1])
+        self._publish_entity_snapshot()
+
+        # Server update handlers
+        self.update_handlers = {
+            'world_chunk': self.handle_world_chunk,
+            'entity_update': self.handle_entity_update,
+            'player_update': self.handle_player_update,
+            'chat': self.handle_chat_message,
+            'collision': self.handle_collision,
+            'npc_interaction': self.handle_npc_interaction
+        }
+
     def update(self, dt):
         """Update game state"""
         with self.lock:
@@ -127,96 +378,104 @@ class GameStateManager:
             # Clean up old chunks
             self.cleanup_chunks()
 
-            # Calculate update rate
-            current_time = time.time()
-            self.update_rate = 1.0 / (current_time - self.last_update_time)
-            self.last_update_time = current_time
+            # Smooth frame time for the update rate readout, seeded with the
+            # first frame so the readout does not start out inflated
+            if not self._dt_ema:
+                self._dt_ema = dt
+            else:
+                self._dt_ema += (dt - self._dt_ema) * UPDATE_RATE_SMOOTHING
+
+            self._publish_player_snapshot()
+            self._publish_entity_snapshot()
+
+    def _publish_player_snapshot(self):
+        """Publish an immutable player snapshot for lock-free UI reads"""
+        player = self.player
+        # Single reference assignment, so readers never see a torn state
+        self._player_snapshot = (
+            player.position.tolist(),
+            player.health,
+            player.max_health,
+            player.mana,
+            player.max_mana
+        )
 
-    def update_player_movement(self, dt):
-        """Update player position based on input"""
-        move_speed = 5.0  # meters per second
-        if self.input_state.get('run'):
-            move_speed *= 2.0
+    def _publish_entity_snapshot(self):
+        """Copy entity arrays into the back buffer and publish it for UI reads"""
+        if self._entity_snapshot[0] == self.entities_version:
+            return
+
+        pool = self.entity_pool
+        count = pool.count
 
-        # Calculate movement vector
-        move_vector = [0.0, 0.0, 0.0]
+        back = 1 - self._entity_buffer_index
+        positions, type_codes = self._entity_buffers[back]
+        if len(positions) < count:
+            positions = np.empty((pool.capacity, 3), dtype=pool.POSITION_DTYPE)
+            type_codes = np.empty(pool.capacity, dtype=np.uint8)
+            self._entity_buffers[back] = (positions, type_codes)
 
-        if self.input_state['forward']:
-            move_vector[2] -= move_speed * dt
-        if self.input_state['backward']:
-            move_vector[2] += move_speed * dt
-        if self.input_state['left']:
-            move_vector[0] -= move_speed * dt
-        if self.input_state['right']:
-            move_vector[0] += move_speed * dt
-        if self.input_state['jump']:
-            move_vector[1] += move_speed * dt
+        positions[:count] = pool.positions[:count]
+        type_codes[:count] = pool.type_codes[:count]
 
-        # Apply movement to player position
-        self.player.position[0] += move_vector[0]
-        self.player.position[1] += move_vector[1]
-        self.player.position[2] += move_vector[2]
+        # Single reference assignment, so readers never see a torn state
+        self._entity_snapshot = (self.entities_version, positions[:count], type_codes[:count])
+        self._entity_buffer_index = back
 
-        # Apply gravity
-        if self.player.position[1] > 0:
-            self.player.position[1] -= 9.8 * dt  # gravity
+    def update_player_movement(self, dt):
+        """Update player position based on input"""
+        input_mask = self.input_mask
 
-        # Clamp to ground
-        if self.player.position[1] < 0:
-            self.player.position[1] = 0
+        move_speed = 5.0  # meters per second
+        if input_mask & INPUT_RUN:
+            move_speed *= 2.0
 
-        # Update player velocity
-        self.player.velocity = move_vector
+        _step_player(
+            self.player.position,
+            self.player.velocity,
+            input_mask & INPUT_MOVEMENT_MASK,
+            dt,
+            move_speed
+        )
 
     def update_entities(self, dt):
-        """Update entity states"""
-        for entity_id, entity in list(self.entities.items()):
-            # Simple movement for NPCs
-            if entity.entity_type == 'npc':
-                # Add simple AI movement here
-                pass
+        """Update entity states
 
-            # Update animation timers
-            if entity.animation:
-                # Animation update logic
-                pass
+        Entities have no per-frame work yet; NPC movement and animation
+        timers belong here once they do.
+        """
 
     def cleanup_chunks(self):
         """Unload distant chunks"""
-        current_time = time.time()
-        chunks_to_remove = []
+        current_time = time.monotonic_ns()
+        expiry = self._chunk_expiry
+
+        # Only chunks whose earliest expiry has passed are examined
+        while expiry and expiry[0][0] < current_time:
+            _, chunk_key = heapq.heappop(expiry)
+            chunk = self.chunks.get(chunk_key)
 
-        for chunk_key, chunk in self.chunks.items():
             # Check if chunk hasn't been accessed in 60 seconds
-            if current_time - chunk.last_accessed > 60:
-                chunks_to_remove.append(chunk_key)
+            if chunk and current_time - chunk.last_accessed > CHUNK_TTL_NS:
+                del self.chunks[chunk_key]
 
-        for chunk_key in chunks_to_remove:
-            del self.chunks[chunk_key]
+    def _schedule_chunk_expiry(self, chunk_key, chunk):
+        """Queue a chunk for an idle check once its TTL elapses"""
+        heapq.heappush(self._chunk_expiry, (chunk.last_accessed + CHUNK_TTL_NS, chunk_key))
 
     def apply_server_update(self, update_data):
         """Apply update from server to game state"""
         with self.lock:
-            update_type = update_data.get('type')
-
-            if update_type == 'world_chunk':
-                self.handle_world_chunk(update_data)
-            elif update_type == 'entity_update':
-                self.handle_entity_update(update_data)
-            elif update_type == 'player_update':
-                self.handle_player_update(update_data)
-            elif update_type == 'chat':
-                self.handle_chat_message(update_data)
-            elif update_type == 'collision':
-                self.handle_collision(update_data)
-            elif update_type == 'npc_interaction':
-                self.handle_npc_interaction(update_data)
+            handler = self.update_handlers.get(update_data.get('type'))
+            if handler:
+                handler(update_data)
+                self._publish_player_snapshot()
 
     def handle_world_chunk(self, data):
         """Handle world chunk data from server"""
         chunk_x = data['chunk_x']
         chunk_z = data['chunk_z']
-        chunk_key = f"{chunk_x}_{chunk_z}"
+        chunk_key = pack_chunk_key(chunk_x, chunk_z)
 
         # Create or update chunk
         if chunk_key not in self.chunks:
@@ -230,21 +489,32 @@ class GameStateManager:
         # Update entities in chunk
         chunk = self.chunks[chunk_key]
         chunk.loaded = True
-        chunk.last_accessed = time.time()
+        chunk.last_accessed = time.monotonic_ns()
+        self._schedule_chunk_expiry(chunk_key, chunk)
 
         # Process entities
+        moved_ids = []
+        moved_positions = []
         entity_data = data.get('data', {}).get('entities', [])
         for entity_info in entity_data:
             entity_id = entity_info['id']
 
             # Update or create entity
             if entity_id in self.entities:
-                self.update_entity_from_data(entity_id, entity_info)
+                self.update_entity_from_data(entity_id, entity_info, interpolate=False)
+                if 'position' in entity_info:
+                    moved_ids.append(entity_id)
+                    moved_positions.append(entity_info['position'][:3])
             else:
                 self.create_entity_from_data(entity_info)
 
+        self.interpolate_positions(moved_ids, moved_positions)
+
     def handle_entity_update(self, data):
         """Handle entity updates from server"""
+        moved_ids = []
+        moved_positions = []
+
         for entity_info in data.get('entities', []):
             entity_id = entity_info['id']
 
@@ -254,10 +524,16 @@ class GameStateManager:
             else:
                 # Update other entity
                 if entity_id in self.entities:
-                    self.update_entity_from_data(entity_id, entity_info)
+                    self.update_entity_from_data(entity_id, entity_info, interpolate=False)
+                    if 'position' in entity_info:
+                        moved_ids.append(entity_id)
+                        moved_positions.append(entity_info['position'][:3])
                 else:
                     self.create_entity_from_data(entity_info)
 
+        # Interpolate every moved entity in one vectorized step
+        self.interpolate_positions(moved_ids, moved_positions)
+
     def handle_player_update(self, data):
         """Handle player state update from server"""
         # Update player stats
@@ -266,7 +542,7 @@ class GameStateManager:
         if 'max_health' in data:
             self.player.max_health = data['max_health']
         if 'position' in data:
-            self.player.position = data['position']
+            self.player.position[:] = data['position'][:3]
         if 'rotation' in data:
             self.player.rotation = data['rotation']
 
@@ -281,10 +557,6 @@ class GameStateManager:
 
         self.chat_messages.append(chat_message)
 
-        # Keep only last 1000 messages
-        if len(self.chat_messages) > 1000:
-            self.chat_messages = self.chat_messages[-1000:]
-
     def handle_collision(self, data):
         """Handle collision event"""
         # Process collision effects
@@ -332,22 +604,44 @@ class GameStateManager:
         )
 
         self.entities[entity.entity_id] = entity
+        self.entity_pool.allocate(entity)
+        self._spatial_dirty = True
+        self.entities_version += 1
         return entity
 
-    def update_entity_from_data(self, entity_id, entity_data):
+    def interpolate_positions(self, entity_ids, positions, factor=0.2):
+        """Blend entity pool rows towards server positions"""
+        if not entity_ids:
+            return
+
+        # Fancy-indexed += applies one write per row, so a batch naming an
+        # entity twice keeps only its latest position
+        latest = dict(zip(entity_ids, positions))
+
+        slots = self.entity_pool.slots
+        indices = np.fromiter(
+            (slots[entity_id] for entity_id in latest),
+            dtype=np.intp,
+            count=len(latest)
+        )
+        targets = np.array(list(latest.values()), dtype=EntityPool.POSITION_DTYPE)
+
+        pool_positions = self.entity_pool.positions
+        pool_positions[indices] += (targets - pool_positions[indices]) * factor
+        self._spatial_dirty = True
+        self.entities_version += 1
+
+    def update_entity_from_data(self, entity_id, entity_data, interpolate=True):
         """Update existing entity from server data"""
         if entity_id not in self.entities:
             return
 
         entity = self.entities[entity_id]
 
-        # Update properties
-        if 'position' in entity_data:
+        # Update properties (batch callers interpolate positions themselves)
+        if interpolate and 'position' in entity_data:
             # Interpolate for smooth movement
-            new_pos = entity_data['position']
-            # Simple interpolation (could be more sophisticated)
-            for i in range(3):
-                entity.position[i] += (new_pos[i] - entity.position[i]) * 0.2
+            self.interpolate_positions([entity_id], [entity_data['position'][:3]])
 
         if 'rotation' in entity_data:
             entity.rotation = entity_data['rotation']
@@ -370,7 +664,7 @@ class GameStateManager:
         # Server-authoritative updates for player
         if 'position' in player_data:
             # Snap to server position (or interpolate for smoother movement)
-            self.player.position = player_data['position']
+            self.player.position[:] = player_data['position'][:3]
 
         if 'rotation' in player_data:
             self.player.rotation = player_data['rotation']
@@ -381,77 +675,140 @@ class GameStateManager:
         if 'max_health' in player_data:
             self.player.max_health = player_data['max_health']
 
-    # Property getters for UI
+    # Property getters for UI (read the published snapshot, no locking)
     @property
     def player_position(self):
         """Get player position for UI"""
-        return self.player.position
+        return self._player_snapshot[0]
 
     @property
     def player_health(self):
         """Get player health for UI"""
-        return self.player.health
+        return self._player_snapshot[1]
 
     @property
     def player_max_health(self):
         """Get player max health for UI"""
-        return self.player.max_health
+        return self._player_snapshot[2]
 
     @property
     def player_mana(self):
         """Get player mana for UI"""
-        return self.player.mana
+        return self._player_snapshot[3]
 
     @property
     def player_max_mana(self):
         """Get player max mana for UI"""
-        return self.player.max_mana
+        return self._player_snapshot[4]
+
+    @property
+    def entity_snapshot(self):
+        """Get (version, positions, type_codes) of entities for UI
+
+        The arrays are reused by later snapshots, so copy anything kept
+        past the current frame.
+        """
+        return self._entity_snapshot
+
+    @property
+    def update_rate(self):
+        """Get smoothed updates per second"""
+        return 1.0 / self._dt_ema if self._dt_ema > 0 else 0.0
 
     @property
     def loaded_chunks(self):
-        """Get loaded chunk keys"""
-        return list(self.chunks.keys())
+        """Get a live view of loaded chunk keys (see pack_chunk_key)
+
+        Iterate it on the thread that updates the game state.
+        """
+        return self.chunks.keys()
+
+    def _rebuild_spatial_index(self):
+        """Rebuild the KD-tree over current entity positions"""
+        pool = self.entity_pool
+        self._spatial_tree = None
+
+        if SCIPY_AVAILABLE and pool.count:
+            self._spatial_tree = cKDTree(pool.positions[:pool.count])
+
+        self._spatial_dirty = False
 
     def get_nearby_entities(self, position, radius=50):
         """Get entities near a position"""
-        nearby = []
+        with self.lock:
+            if self._spatial_dirty:
+                self._rebuild_spatial_index()
+
+            pool = self.entity_pool
+
+            if self._spatial_tree is not None:
+                indices = self._spatial_tree.query_ball_point(position[:3], radius)
+            else:
+                offsets = pool.positions[:pool.count] - np.asarray(position[:3], dtype=pool.POSITION_DTYPE)
+                dist_sq = np.einsum('ij,ij->i', offsets, offsets)
+                indices = np.flatnonzero(dist_sq <= radius * radius)
+
+            return [pool.entities[i] for i in indices]
 
-        for entity_id, entity in self.entities.items():
-            # Calculate distance
-            dx = entity.position[0] - position[0]
-            dy = entity.position[1] - position[1]
-            dz = entity.position[2] - position[2]
-            distance = math.sqrt(dx*dx + dy*dy + dz*dz)
+    def get_closest_entity(self, position, radius=50):
+        """Get the entity closest to a position within radius, or None"""
+        with self.lock:
+            if self._spatial_dirty:
+                self._rebuild_spatial_index()
+
+            pool = self.entity_pool
+            if pool.count == 0:
+                return None
 
-            if distance <= radius:
-                nearby.append(entity)
+            if self._spatial_tree is not None:
+                distance, index = self._spatial_tree.query(position[:3], distance_upper_bound=radius)
+                if index == pool.count:
+                    return None
+            else:
+                # Squared distance orders the same and skips the sqrt
+                offsets = pool.positions[:pool.count] - np.asarray(position[:3], dtype=pool.POSITION_DTYPE)
+                dist_sq = np.einsum('ij,ij->i', offsets, offsets)
+                index = int(dist_sq.argmin())
+                if dist_sq[index] > radius * radius:
+                    return None
 
-        return nearby
+            return pool.entities[index]
 
     def save_state(self, filename):
         """Save game state to file"""
         with self.lock:
             state = {
-                'player': self.player.__dict__,
-                'entities': {eid: ent.__dict__ for eid, ent in self.entities.items()},
-                'chunks': {ckey: {
+                'player': _fields_dict(self.player),
+                'entities': {eid: _fields_dict(ent) for eid, ent in self.entities.items()},
+                'chunks': {f"{c.chunk_x}_{c.chunk_z}": {
                     'chunk_x': c.chunk_x,
                     'chunk_z': c.chunk_z,
                     'loaded': c.loaded
-                } for ckey, c in self.chunks.items()},
+                } for c in self.chunks.values()},
                 'game_time': self.game_time,
                 'time_of_day': self.time_of_day
             }
 
-            with open(filename, 'w') as f:
-                json.dump(state, f, indent=2)
+            if ORJSON_AVAILABLE:
+                with open(filename, 'wb') as f:
+                    f.write(orjson.dumps(
+                        state,
+                        default=_json_default,
+                        option=(orjson.OPT_INDENT_2 |
+                                orjson.OPT_SERIALIZE_NUMPY |
+                                orjson.OPT_NON_STR_KEYS)
+                    ))
+            else:
+                with open(filename, 'w') as f:
+                    json.dump(state, f, indent=2, default=_json_default)
 
     def load_state(self, filename):
         """Load game state from file"""
         with self.lock:
             try:
-                with open(filename, 'r') as f:
-                    state = json.load(f)
+                with open(filename, 'rb') as f:
+                    raw = f.read()
+                state = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
 
                 # Load player
                 player_data = state.get('player', {})
@@ -459,20 +816,35 @@ class GameStateManager:
 
                 # Load entities
                 self.entities.clear()
+                self.entity_pool.clear()
                 for eid, edata in state.get('entities', {}).items():
                     entity = EntityState(**edata)
                     self.entities[int(eid)] = entity
+                    self.entity_pool.allocate(entity)
+                self._spatial_dirty = True
+                self.entities_version += 1
 
                 # Load chunks
                 self.chunks.clear()
-                for ckey, cdata in state.get('chunks', {}).items():
-                    chunk = WorldChunk(**cdata)
-                    self.chunks[ckey] = chunk
+                self._chunk_expiry.clear()
+                for cdata in state.get('chunks', {}).values():
+                    chunk = WorldChunk(
+                        chunk_x=cdata['chunk_x'],
+                        chunk_z=cdata['chunk_z'],
+                        terrain_data=[],
+                        entities=[],
+                        loaded=cdata.get('loaded', False)
+                    )
+                    chunk_key = pack_chunk_key(chunk.chunk_x, chunk.chunk_z)
+                    self.chunks[chunk_key] = chunk
+                    self._schedule_chunk_expiry(chunk_key, chunk)
 
                 # Load time
                 self.game_time = state.get('game_time', 0.0)
                 self.time_of_day = state.get('time_of_day', 12.0)
 
+                self._publish_player_snapshot()
+
                 return True
 
             except Exception as e:
@@ -10,11 +10,12 @@ from kivy.uix.floatlayout import FloatLayout
 from kivy.uix.label import Label
 from kivy.uix.button import Button
 from kivy.uix.textinput import TextInput
-from kivy.uix.scrollview import ScrollView
 from kivy.uix.gridlayout import GridLayout
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
 from kivy.uix.image import Image
 from kivy.uix.widget import Widget
-from kivy.graphics import Color, Rectangle, Line
+from kivy.graphics import Color, Rectangle, Line, Mesh
 from kivy.clock import Clock
 from kivy.core.window import Window
 from kivy.graphics.texture import Texture
@@ -24,66 +25,163 @@ from kivy.properties import (
 )
 
 import threading
-import time
+
 import numpy as np
 
+from game import ENTITY_TYPE_PLAYER
+
+
+# EMA weight of the newest frame in the FPS counter
+FPS_SMOOTHING = 0.1
+
+# Precomputed stat label texts, indexed by value (clamped to the last entry)
+FPS_TEXTS = tuple(f"FPS: {i}" for i in range(1000))
+PING_TEXTS = tuple(f"Ping: {i}ms" for i in range(1000))
+
+# Chat messages kept in the history
+CHAT_MAX_MESSAGES = 100
+
+# Minimap grid lines on each side of the center
+MINIMAP_GRID_SIZE = 20
+
+# Kivy mesh indices are 16-bit
+MESH_MAX_VERTICES = 65535
+
+# Line segments outlining an entity marker (diamond of radius 3)
+ENTITY_MARKER = np.array([
+    [3, 0], [0, 3],
+    [0, 3], [-3, 0],
+    [-3, 0], [0, -3],
+    [0, -3], [3, 0]
+], dtype=np.float32)
+
+
+def set_line_mesh(mesh, points):
+    """Load (N, 2) line segment endpoints into a Mesh"""
+    points = points[:MESH_MAX_VERTICES - MESH_MAX_VERTICES % 2]
+
+    # Default mesh format is x, y, u, v per vertex
+    vertices = np.zeros((len(points), 4), dtype=np.float32)
+    vertices[:, :2] = points
+
+    mesh.vertices = vertices.ravel().tolist()
+    mesh.indices = list(range(len(points)))
+
 
 class MinimapWidget(Widget):
     """Minimap display widget"""
 
-    player_pos = ListProperty([0, 0])
-    entities = ListProperty([])
+    player_pos = ListProperty([0, 0, 0])
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.bind(pos=self.update_canvas, size=self.update_canvas)
-        self.bind(player_pos=self.update_canvas, entities=self.update_canvas)
 
         # Minimap settings
         self.map_scale = 10.0
         self.map_center = [0, 0]
         self.map_size = [100, 100]
 
-        self.update_canvas()
-
-    def update_canvas(self, *args):
-        """Redraw minimap"""
-        self.canvas.clear()
+        # Positions of entities shown on the map
+        self._entity_positions = np.zeros((0, 3), dtype=np.float32)
 
+        # Build instructions once; redraws only update them
         with self.canvas:
             # Background
             Color(0.1, 0.1, 0.1, 0.8)
-            Rectangle(pos=self.pos, size=self.size)
+            self._background = Rectangle(pos=self.pos, size=self.size)
 
             # Grid
             Color(0.3, 0.3, 0.3, 0.5)
-            grid_size = 20
-            for i in range(-grid_size, grid_size + 1):
-                x = self.center_x + i * self.map_scale
-                Line(points=[x, self.y, x, self.y + self.height], width=1)
-                y = self.center_y + i * self.map_scale
-                Line(points=[self.x, y, self.x + self.width, y], width=1)
-
-            # Player
-            Color(0, 1, 0, 1)
-            player_x = self.center_x + self.player_pos[0] * self.map_scale
-            player_y = self.center_y + self.player_pos[2] * self.map_scale
-            Line(circle=[player_x, player_y, 5], width=2)
+            self._grid_mesh = Mesh(mode='lines')
 
-            # Player direction
-            Line(points=[
-                player_x, player_y,
-                player_x + 10, player_y
-            ], width=2)
+            # Player and direction
+            Color(0, 1, 0, 1)
+            self._player_marker = Line(circle=(0, 0, 5), width=2)
+            self._player_direction = Line(points=[0, 0, 0, 0], width=2)
 
             # Entities
-            for entity in self.entities:
-                if entity.get('type') != 'player':
-                    Color(1, 0.5, 0, 1)
-                    pos = entity.get('position', [0, 0, 0])
-                    ex = self.center_x + pos[0] * self.map_scale
-                    ey = self.center_y + pos[2] * self.map_scale
-                    Line(circle=[ex, ey, 3], width=1)
+            Color(1, 0.5, 0, 1)
+            self._entity_mesh = Mesh(mode='lines')
+
+        # Layout changes move everything; player moves only redraw the marker
+        self.bind(pos=self._redraw_static, size=self._redraw_static)
+        self.bind(player_pos=self._redraw_dynamic)
+
+        self._redraw_static()
+
+    def _redraw_static(self, *args):
+        """Redraw background and grid, then re-place markers on the new layout"""
+        # Background
+        self._background.pos = self.pos
+        self._background.size = self.size
+
+        # Grid
+        offsets = np.arange(-MINIMAP_GRID_SIZE, MINIMAP_GRID_SIZE + 1) * self.map_scale
+        grid = np.empty((len(offsets), 4, 2), dtype=np.float32)
+        grid[:, 0:2, 0] = (self.center_x + offsets)[:, None]
+        grid[:, 0, 1] = self.y
+        grid[:, 1, 1] = self.top
+        grid[:, 2, 0] = self.x
+        grid[:, 3, 0] = self.right
+        grid[:, 2:4, 1] = (self.center_y + offsets)[:, None]
+        set_line_mesh(self._grid_mesh, grid.reshape(-1, 2))
+
+        self._redraw_dynamic()
+        self.update_entity_mesh()
+
+    def _redraw_dynamic(self, *args):
+        """Redraw player marker"""
+        player_x = self.center_x + self.player_pos[0] * self.map_scale
+        player_y = self.center_y + self.player_pos[2] * self.map_scale
+        self._player_marker.circle = (player_x, player_y, 5)
+
+        # Player direction
+        self._player_direction.points = [
+            player_x, player_y,
+            player_x + 10, player_y
+        ]
+
+    def set_entities(self, positions, type_codes):
+        """Show entities from parallel position and type code arrays"""
+        # Boolean indexing copies, so the caller's arrays may change afterwards
+        self._entity_positions = positions[type_codes != ENTITY_TYPE_PLAYER]
+        self.update_entity_mesh()
+
+    def update_entity_mesh(self):
+        """Redraw entity markers (one outline per entity, drawn as one mesh)"""
+        positions = self._entity_positions
+        centers = np.empty((len(positions), 2), dtype=np.float32)
+        centers[:, 0] = self.center_x + positions[:, 0] * self.map_scale
+        centers[:, 1] = self.center_y + positions[:, 2] * self.map_scale
+        markers = centers[:, None, :] + ENTITY_MARKER
+        set_line_mesh(self._entity_mesh, markers.reshape(-1, 2))
+
+
+class ListRow(Label):
+    """Row view recycled by list RecycleViews"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.halign = 'left'
+        self.valign = 'middle'
+        self.bind(size=self.setter('text_size'))
+
+
+def create_list_view(**kwargs):
+    """Create a RecycleView showing rows of {'text': ..., 'color': ...} dicts"""
+    view = RecycleView(**kwargs)
+    view.viewclass = ListRow
+
+    layout = RecycleBoxLayout(
+        orientation='vertical',
+        default_size=(None, 30),
+        default_size_hint=(1, None),
+        size_hint_y=None,
+        spacing=5
+    )
+    layout.bind(minimum_height=layout.setter('height'))
+    view.add_widget(layout)
+    return view
 
 
 class ChatWidget(BoxLayout):
@@ -98,15 +196,9 @@ class ChatWidget(BoxLayout):
         self.spacing = 5
 
         # Message display
-        self.message_scroll = ScrollView(size_hint=(1, 0.8))
-        self.message_layout = GridLayout(
-            cols=1,
-            size_hint_y=None,
-            spacing=5
-        )
-        self.message_layout.bind(minimum_height=self.message_layout.setter('height'))
-        self.message_scroll.add_widget(self.message_layout)
-        self.add_widget(self.message_scroll)
+        self.message_view = create_list_view(size_hint=(1, 0.8))
+        self.add_widget(self.message_view)
+        self._scroll_pending = False
 
         # Input area
         input_layout = BoxLayout(size_hint=(1, 0.2), spacing=5)
@@ -129,28 +221,21 @@ class ChatWidget(BoxLayout):
 
     def add_message(self, sender, message, color=(1, 1, 1, 1)):
         """Add message to chat"""
-        msg_label = Label(
-            text=f"[color={'%02x%02x%02x' % tuple(int(c*255) for c in color)}]{sender}: {message}[/color]",
-            markup=True,
-            size_hint_y=None,
-            height=30,
-            text_size=(self.width - 20, None),
-            halign='left',
-            valign='middle'
-        )
-        msg_label.bind(texture_size=msg_label.setter('size'))
-        self.message_layout.add_widget(msg_label)
+        # Plain text colored through the Label, no markup parsing
+        row = {'text': f"{sender}: {message}", 'color': color}
 
-        # Scroll to bottom
-        Clock.schedule_once(self.scroll_to_bottom, 0.1)
+        # Keep only the last messages; one assignment refreshes the view once
+        self.message_view.data = self.message_view.data[-(CHAT_MAX_MESSAGES - 1):] + [row]
 
-        # Keep only last 100 messages
-        if len(self.message_layout.children) > 100:
-            self.message_layout.remove_widget(self.message_layout.children[-1])
+        # Scroll to bottom on the next frame, once per burst of messages
+        if not self._scroll_pending:
+            self._scroll_pending = True
+            Clock.schedule_once(self.scroll_to_bottom, 0)
 
     def scroll_to_bottom(self, dt):
         """Scroll chat to bottom"""
-        self.message_scroll.scroll_y = 0
+        self._scroll_pending = False
+        self.message_view.scroll_y = 0
 
     def send_message(self, *args):
         """Send chat message"""
@@ -160,6 +245,53 @@ class ChatWidget(BoxLayout):
             self.chat_input.text = ""
 
 
+class InventorySlot(Label):
+    """Inventory slot drawn from a background texture shared by all slots"""
+
+    __events__ = ('on_press',)
+
+    # Slot background color as RGBA bytes
+    BACKGROUND_RGBA = bytes((51, 51, 77, 255))
+
+    _background_texture = None
+
+    def __init__(self, slot_num, **kwargs):
+        super().__init__(text=str(slot_num), **kwargs)
+        self.slot_num = slot_num
+
+        with self.canvas.before:
+            self._background = Rectangle(
+                texture=self.get_background_texture(),
+                pos=self.pos,
+                size=self.size
+            )
+
+        self.bind(pos=self.update_background, size=self.update_background)
+
+    @classmethod
+    def get_background_texture(cls):
+        """Create the shared 1x1 background texture on first use"""
+        if cls._background_texture is None:
+            texture = Texture.create(size=(1, 1), colorfmt='rgba')
+            texture.blit_buffer(cls.BACKGROUND_RGBA, colorfmt='rgba', bufferfmt='ubyte')
+            cls._background_texture = texture
+        return cls._background_texture
+
+    def update_background(self, *args):
+        """Keep background aligned with the slot"""
+        self._background.pos = self.pos
+        self._background.size = self.size
+
+    def on_touch_down(self, touch):
+        if self.collide_point(*touch.pos):
+            self.dispatch('on_press')
+            return True
+        return super().on_touch_down(touch)
+
+    def on_press(self):
+        pass
+
+
 class HealthBar(Widget):
     """Health bar widget"""
 
@@ -172,6 +304,25 @@ class HealthBar(Widget):
         super().__init__(**kwargs)
         self.size_hint = (None, None)
         self.size = (200, 30)
+
+        # Build instructions once; redraws only update them
+        with self.canvas:
+            # Health background
+            Color(0.2, 0.2, 0.2, 1)
+            self._background = Rectangle(pos=self.pos, size=self.size)
+
+            # Health bar
+            self._health_color = Color(0, 1, 0, 1)
+            self._health_rect = Rectangle(pos=self.pos, size=self.size)
+
+            # Mana bar
+            Color(0, 0.5, 1, 1)
+            self._mana_rect = Rectangle(pos=self.pos, size=self.size)
+
+            # Text
+            Color(1, 1, 1, 1)
+            self._text_rect = Rectangle(pos=self.pos, size=self.size)
+
         self.bind(
             pos=self.update_canvas,
             size=self.update_canvas,
@@ -182,41 +333,22 @@ class HealthBar(Widget):
 
     def update_canvas(self, *args):
         """Redraw health bar"""
-        self.canvas.clear()
+        self._background.pos = self.pos
+        self._background.size = self.size
 
-        with self.canvas:
-            # Health background
-            Color(0.2, 0.2, 0.2, 1)
-            Rectangle(pos=self.pos, size=self.size)
-
-            # Health bar
-            health_width = self.width * (self.health / self.max_health)
-            health_color = (
-                1.0 - (self.health / self.max_health),
-                self.health / self.max_health,
-                0,
-                1
-            )
-            Color(*health_color)
-            Rectangle(
-                pos=self.pos,
-                size=(health_width, self.height * 0.6)
-            )
+        # Health bar
+        health_ratio = self.health / self.max_health
+        self._health_color.rgba = (1.0 - health_ratio, health_ratio, 0, 1)
+        self._health_rect.pos = self.pos
+        self._health_rect.size = (self.width * health_ratio, self.height * 0.6)
 
-            # Mana bar
-            mana_width = self.width * (self.mana / self.max_mana)
-            Color(0, 0.5, 1, 1)
-            Rectangle(
-                pos=(self.x, self.y + self.height * 0.6),
-                size=(mana_width, self.height * 0.4)
-            )
+        # Mana bar
+        self._mana_rect.pos = (self.x, self.y + self.height * 0.6)
+        self._mana_rect.size = (self.width * (self.mana / self.max_mana), self.height * 0.4)
 
-            # Text
-            Color(1, 1, 1, 1)
-            self.canvas.add(Rectangle(
-                pos=(self.x + 5, self.y + self.height - 20),
-                size=(self.width - 10, 20)
-            ))
+        # Text
+        self._text_rect.pos = (self.x + 5, self.y + self.height - 20)
+        self._text_rect.size = (self.width - 10, 20)
 
 
 class GameUI(BoxLayout):
@@ -246,11 +378,18 @@ class GameUI(BoxLayout):
         self.create_bottom_bar()
 
         # Stats tracking
-        self.frame_count = 0
-        self.last_fps_time = time.time()
+        self._fps_ema = 0.0
+
+        # Values currently shown, to skip redundant widget updates
+        self._ping_shown = None
+        self._health_shown = None
+
+        # Last game state versions shown (-1 forces the first refresh)
+        self._entities_version = -1
+        self._quests_version = -1
+        self._party_version = -1
 
         # Bind updates
-        Clock.schedule_interval(self.update_fps, 1.0)
         self.bind(size=self.on_size_change)
 
     def create_top_bar(self):
@@ -333,11 +472,7 @@ class GameUI(BoxLayout):
 
         # Add inventory slots
         for i in range(16):
-            slot = Button(
-                text=str(i+1),
-                background_normal='',
-                background_color=(0.2, 0.2, 0.3, 1)
-            )
+            slot = InventorySlot(i + 1)
             slot.bind(on_press=self.on_inventory_click)
             self.inventory_grid.add_widget(slot)
 
@@ -353,29 +488,15 @@ class GameUI(BoxLayout):
         quest_label = Label(text="[b]Quests[/b]", markup=True, size_hint=(1, 0.1))
         right_panel.add_widget(quest_label)
 
-        quest_scroll = ScrollView(size_hint=(1, 0.45))
-        self.quest_layout = GridLayout(
-            cols=1,
-            spacing=5,
-            size_hint_y=None
-        )
-        self.quest_layout.bind(minimum_height=self.quest_layout.setter('height'))
-        quest_scroll.add_widget(self.quest_layout)
-        right_panel.add_widget(quest_scroll)
+        self.quest_view = create_list_view(size_hint=(1, 0.45))
+        right_panel.add_widget(self.quest_view)
 
         # Party
         party_label = Label(text="[b]Party[/b]", markup=True, size_hint=(1, 0.1))
         right_panel.add_widget(party_label)
 
-        party_scroll = ScrollView(size_hint=(1, 0.35))
-        self.party_layout = GridLayout(
-            cols=1,
-            spacing=5,
-            size_hint_y=None
-        )
-        self.party_layout.bind(minimum_height=self.party_layout.setter('height'))
-        party_scroll.add_widget(self.party_layout)
-        right_panel.add_widget(party_scroll)
+        self.party_view = create_list_view(size_hint=(1, 0.35))
+        right_panel.add_widget(self.party_view)
 
         return right_panel
 
@@ -402,81 +523,77 @@ class GameUI(BoxLayout):
     def update(self, dt):
         """Update UI elements"""
         # Update stats
-        self.fps_label.text = f"FPS: {self.fps}"
-        self.ping_label.text = f"Ping: {self.ping}ms"
+        self.update_fps(dt)
+
+        ping = self.ping
+        if ping != self._ping_shown:
+            self._ping_shown = ping
+            self.ping_label.text = PING_TEXTS[min(max(int(ping), 0), len(PING_TEXTS) - 1)]
 
         # Update health bar
         if hasattr(self.game_state, 'player_health'):
-            self.health_bar.health = self.game_state.player_health
-            self.health_bar.max_health = self.game_state.player_max_health
-            self.health_bar.mana = self.game_state.player_mana
-            self.health_bar.max_mana = self.game_state.player_max_mana
+            health = (
+                self.game_state.player_health,
+                self.game_state.player_max_health,
+                self.game_state.player_mana,
+                self.game_state.player_max_mana
+            )
+            if health != self._health_shown:
+                self._health_shown = health
+                self.health_bar.health = self.game_state.player_health
+                self.health_bar.max_health = self.game_state.player_max_health
+                self.health_bar.mana = self.game_state.player_mana
+                self.health_bar.max_mana = self.game_state.player_max_mana
 
         # Update minimap
         if hasattr(self.game_state, 'player_position'):
             self.minimap.player_pos = self.game_state.player_position
 
-            # Update entities on minimap
-            entities = []
-            for entity_id, entity_data in self.game_state.entities.items():
-                if entity_id != 0:  # Not player
-                    entities.append({
-                        'type': entity_data.get('type', 'unknown'),
-                        'position': entity_data.get('position', [0, 0, 0])
-                    })
-            self.minimap.entities = entities
+            # Update entities on minimap when they changed
+            entities_version, positions, type_codes = self.game_state.entity_snapshot
+            if entities_version != self._entities_version:
+                self._entities_version = entities_version
+                self.minimap.set_entities(positions, type_codes)
 
         # Update quests
-        self.update_quest_list()
+        quests_version = self.game_state.quests_version
+        if quests_version != self._quests_version:
+            self._quests_version = quests_version
+            self.update_quest_list()
 
         # Update party
-        self.update_party_list()
+        party_version = self.game_state.party_version
+        if party_version != self._party_version:
+            self._party_version = party_version
+            self.update_party_list()
 
     def update_fps(self, dt):
-        """Update FPS counter"""
-        current_time = time.time()
-        elapsed = current_time - self.last_fps_time
-        self.fps = int(self.frame_count / elapsed)
-        self.frame_count = 0
-        self.last_fps_time = current_time
+        """Update FPS counter from a moving average of frame times"""
+        if dt > 0:
+            self._fps_ema += FPS_SMOOTHING * (1.0 / dt - self._fps_ema)
+
+        fps = int(self._fps_ema)
+        if fps != self.fps:
+            self.fps = fps
+            self.fps_label.text = FPS_TEXTS[min(fps, len(FPS_TEXTS) - 1)]
 
     def update_quest_list(self):
         """Update quest list display"""
-        self.quest_layout.clear_widgets()
-
         if hasattr(self.game_state, 'quests'):
-            for quest in self.game_state.quests:
-                quest_label = Label(
-                    text=quest.get('name', 'Unknown Quest'),
-                    size_hint_y=None,
-                    height=30,
-                    text_size=(self.quest_layout.width - 10, None),
-                    halign='left',
-                    valign='middle'
-                )
-                quest_label.bind(texture_size=quest_label.setter('size'))
-                self.quest_layout.add_widget(quest_label)
+            self.quest_view.data = [
+                {'text': quest.get('name', 'Unknown Quest')} for quest in self.game_state.quests
+            ]
 
     def update_party_list(self):
         """Update party list display"""
-        self.party_layout.clear_widgets()
-
         if hasattr(self.game_state, 'party_members'):
-            for member in self.game_state.party_members:
-                member_label = Label(
-                    text=member.get('name', 'Unknown'),
-                    size_hint_y=None,
-                    height=30,
-                    text_size=(self.party_layout.width - 10, None),
-                    halign='left',
-                    valign='middle'
-                )
-                member_label.bind(texture_size=member_label.setter('size'))
-                self.party_layout.add_widget(member_label)
+            self.party_view.data = [
+                {'text': member.get('name', 'Unknown')} for member in self.game_state.party_members
+            ]
 
     def on_inventory_click(self, instance):
         """Handle inventory slot click"""
-        slot_num = int(instance.text)
+        slot_num = instance.slot_num
         print(f"Inventory slot {slot_num} clicked")
 
         # This would trigger item use or display
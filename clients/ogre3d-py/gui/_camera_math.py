@@ -0,0 +1,63 @@
+"""
+Camera orientation math for the input handler
+"""
+
+import math
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+# Layout of the camera basis buffer
+BASIS_SIZE = 10
+QUATERNION = slice(0, 4)
+FORWARD = slice(4, 7)
+RIGHT = slice(7, 10)
+
+
+def new_basis():
+    """Allocate a camera basis buffer"""
+    return np.zeros(BASIS_SIZE, dtype=np.float64)
+
+
+@njit(cache=True, fastmath=True)
+def camera_basis(yaw, pitch, out):
+    """Write rotation quaternion, forward and right vectors into out"""
+    # Half angles for the quaternion
+    chy = math.cos(yaw * 0.5)
+    shy = math.sin(yaw * 0.5)
+    chp = math.cos(pitch * 0.5)
+    shp = math.sin(pitch * 0.5)
+
+    out[0] = chy * shp
+    out[1] = shy * shp
+    out[2] = shy * chp
+    out[3] = chy * chp
+
+    # Full angles from the double-angle identities
+    cy = chy * chy - shy * shy
+    sy = 2.0 * shy * chy
+    cp = chp * chp - shp * shp
+    sp = 2.0 * shp * chp
+
+    # Forward is unit length by construction
+    out[4] = sy * cp
+    out[5] = sp
+    out[6] = cy * cp
+
+    # Forward crossed with up (0, 1, 0), normalized; pitch is clamped short
+    # of the poles so cp stays positive
+    out[7] = cy
+    out[8] = 0.0
+    out[9] = -sy
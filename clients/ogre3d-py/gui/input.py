@@ -6,6 +6,30 @@ from kivy.core.window import Window
 from kivy.uix.widget import Widget
 from kivy.vector import Vector
 import math
+import time
+
+import numpy as np
+
+from game import INPUT_ACTIONS
+
+from ._camera_math import FORWARD, QUATERNION, RIGHT, camera_basis, new_basis
+
+
+# Keycodes with a name, for bindings (would need expansion for all keys)
+KEYMAP = {
+    119: 'w', 97: 'a', 115: 's', 100: 'd',
+    32: 'space', 304: 'shift', 306: 'ctrl',
+    101: 'e', 9: 'tab', 27: 'escape'
+}
+
+# Keycodes below this resolve to actions through a flat table
+KEYCODE_TABLE_SIZE = 512
+
+# Movement is resent once the player has moved this far...
+MOVEMENT_SEND_DISTANCE = 0.05
+
+# ...or this many seconds have passed since the last send
+MOVEMENT_SEND_INTERVAL = 0.1
 
 
 class GameInputHandler(Widget):
@@ -17,16 +41,26 @@ class GameInputHandler(Widget):
         self.network_client = network_client
 
         # Input state
-        self.keys_pressed = set()
         self.mouse_pos = (0, 0)
         self.mouse_delta = (0, 0)
         self.mouse_sensitivity = 0.002
+        self._pending_dx = 0.0
+        self._pending_dy = 0.0
 
         # Camera control
         self.camera_yaw = 0.0
         self.camera_pitch = 0.0
         self.camera_distance = 10.0
 
+        # Last movement sent to the server
+        self._last_sent_pos = np.zeros(3)
+        self._last_sent_rot = None
+        self._last_send_time = 0.0
+
+        # Quaternion, forward and right vectors, refreshed by update_camera_basis
+        self._basis = new_basis()
+        self.update_camera_basis()
+
         # Input bindings
         self.key_bindings = {
             'w': 'forward',
@@ -40,6 +74,7 @@ class GameInputHandler(Widget):
             'tab': 'inventory',
             'escape': 'menu'
         }
+        self.rebuild_key_table()
 
         # Setup input handlers
         self.setup_input_handlers()
@@ -62,17 +97,23 @@ class GameInputHandler(Widget):
         if Window.mouse_pos:
             self.last_mouse_pos = Window.mouse_pos
 
+    def rebuild_key_table(self):
+        """Resolve key_bindings into keycode -> action and input flag tables"""
+        self._code_to_action = [None] * KEYCODE_TABLE_SIZE
+        self._code_to_input = [0] * KEYCODE_TABLE_SIZE
+        for code, name in KEYMAP.items():
+            if code < KEYCODE_TABLE_SIZE:
+                action = self.key_bindings.get(name)
+                self._code_to_action[code] = action
+                self._code_to_input[code] = INPUT_ACTIONS.get(action, 0)
+
     def on_key_down(self, window, key, scancode, codepoint, modifiers):
         """Handle key press"""
-        key_name = self.get_key_name(key)
-
-        if key_name in self.key_bindings:
-            action = self.key_bindings[key_name]
-            self.keys_pressed.add(action)
+        action = self._code_to_action[key] if 0 <= key < KEYCODE_TABLE_SIZE else None
 
+        if action is not None:
             # Update game state
-            if action in self.game_state.input_state:
-                self.game_state.input_state[action] = True
+            self.game_state.input_mask |= self._code_to_input[key]
 
             # Handle special actions
             if action == 'interact':
@@ -88,15 +129,11 @@ class GameInputHandler(Widget):
 
     def on_key_up(self, window, key, scancode):
         """Handle key release"""
-        key_name = self.get_key_name(key)
-
-        if key_name in self.key_bindings:
-            action = self.key_bindings[key_name]
-            self.keys_pressed.discard(action)
+        action = self._code_to_action[key] if 0 <= key < KEYCODE_TABLE_SIZE else None
 
+        if action is not None:
             # Update game state
-            if action in self.game_state.input_state:
-                self.game_state.input_state[action] = False
+            self.game_state.input_mask &= ~self._code_to_input[key]
 
             return True
 
@@ -107,12 +144,25 @@ class GameInputHandler(Widget):
         if not hasattr(self, 'last_mouse_pos'):
             self.last_mouse_pos = pos
 
-        # Calculate delta
-        dx = pos[0] - self.last_mouse_pos[0]
-        dy = pos[1] - self.last_mouse_pos[1]
+        # Accumulate delta; camera is updated once per frame in update()
+        self._pending_dx += pos[0] - self.last_mouse_pos[0]
+        self._pending_dy += pos[1] - self.last_mouse_pos[1]
 
-        self.mouse_delta = (dx, dy)
         self.mouse_pos = pos
+        self.last_mouse_pos = pos
+
+        return True
+
+    def apply_mouse_motion(self):
+        """Apply mouse movement accumulated since the last frame"""
+        dx = self._pending_dx
+        dy = self._pending_dy
+        if not (dx or dy):
+            return
+
+        self._pending_dx = 0.0
+        self._pending_dy = 0.0
+        self.mouse_delta = (dx, dy)
 
         # Update camera rotation
         if self.focus:
@@ -123,19 +173,18 @@ class GameInputHandler(Widget):
             self.camera_pitch = max(-math.pi/2 + 0.1, min(math.pi/2 - 0.1, self.camera_pitch))
 
             # Update game state camera
-            self.game_state.camera_rotation = self.calculate_camera_quaternion()
+            self.update_camera_basis()
+            self.game_state.camera_rotation = self._basis[QUATERNION].tolist()
 
             # Center mouse (for first-person controls)
             if Window.mouse_pos:
                 center_x = Window.width / 2
                 center_y = Window.height / 2
+                pos = self.mouse_pos
                 if abs(pos[0] - center_x) > 50 or abs(pos[1] - center_y) > 50:
-                    Window.mouse_pos = (center_x, center_y)
+                    # Set before moving so the synthesized move event has no delta
                     self.last_mouse_pos = (center_x, center_y)
-                else:
-                    self.last_mouse_pos = pos
-
-        return True
+                    Window.mouse_pos = (center_x, center_y)
 
     def on_mouse_down(self, window, x, y, button, modifiers):
         """Handle mouse button press"""
@@ -174,18 +223,13 @@ class GameInputHandler(Widget):
     def on_interact(self):
         """Handle interact key (E)"""
         if self.network_client.connected:
-            # Find nearby entity to interact with
-            nearby = self.game_state.get_nearby_entities(
+            # Interact with the closest nearby entity
+            closest = self.game_state.get_closest_entity(
                 self.game_state.player_position,
                 radius=5.0
             )
 
-            if nearby:
-                # Interact with closest entity
-                closest = min(nearby, key=lambda e:
-                    math.sqrt(sum((p - e.position[i])**2 for i, p in enumerate(self.game_state.player_position)))
-                )
-
+            if closest is not None:
                 self.network_client.send_entity_interaction(
                     entity_id=closest.entity_id,
                     interaction_type='interact'
@@ -201,43 +245,43 @@ class GameInputHandler(Widget):
         # Toggle pause menu
         print("Menu toggled")
 
+    def update_camera_basis(self):
+        """Recompute camera orientation vectors from yaw and pitch"""
+        camera_basis(self.camera_yaw, self.camera_pitch, self._basis)
+
     def calculate_camera_quaternion(self):
-        """Calculate camera rotation quaternion from yaw and pitch"""
-        # Convert yaw and pitch to quaternion
-        cy = math.cos(self.camera_yaw * 0.5)
-        sy = math.sin(self.camera_yaw * 0.5)
-        cp = math.cos(self.camera_pitch * 0.5)
-        sp = math.sin(self.camera_pitch * 0.5)
-
-        return [
-            cy * sp,  # x
-            sy * sp,  # y
-            sy * cp,  # z
-            cy * cp   # w
-        ]
+        """Get camera rotation quaternion (view of the camera basis)"""
+        return self._basis[QUATERNION]
 
     def get_key_name(self, keycode):
         """Convert keycode to string name"""
-        # Simple mapping (would need expansion for all keys)
-        keymap = {
-            119: 'w', 97: 'a', 115: 's', 100: 'd',
-            32: 'space', 304: 'shift', 306: 'ctrl',
-            101: 'e', 9: 'tab', 27: 'escape'
-        }
-
-        return keymap.get(keycode, '')
+        return KEYMAP.get(keycode, '')
 
     def update(self, dt):
         """Update input handling"""
+        self.apply_mouse_motion()
+
         # Send movement update to server
         if self.network_client.connected:
-            # Only send if movement state changed
-            if any(self.game_state.input_state.values()):
-                self.network_client.send_movement(
-                    self.game_state.player.position,
-                    self.game_state.player.rotation,
-                    self.game_state.player.velocity
-                )
+            # Only send while moving, and only once the change is worth a packet
+            if self.game_state.input_mask:
+                player = self.game_state.player
+                now = time.monotonic()
+
+                offset = player.position - self._last_sent_pos
+                moved = offset.dot(offset) > MOVEMENT_SEND_DISTANCE * MOVEMENT_SEND_DISTANCE
+
+                if (moved or now - self._last_send_time > MOVEMENT_SEND_INTERVAL
+                        or player.rotation != self._last_sent_rot):
+                    self.network_client.send_movement(
+                        player.position.tolist(),
+                        player.rotation,
+                        player.velocity.tolist()
+                    )
+
+                    self._last_sent_pos[:] = player.position
+                    self._last_sent_rot = list(player.rotation)
+                    self._last_send_time = now
 
     def set_mouse_sensitivity(self, sensitivity):
         """Set mouse sensitivity"""
@@ -253,35 +297,9 @@ class GameInputHandler(Widget):
             Window.set_system_cursor('arrow')
 
     def get_camera_forward(self):
-        """Get camera forward vector"""
-        # Calculate forward vector from yaw and pitch
-        forward = [
-            math.sin(self.camera_yaw) * math.cos(self.camera_pitch),
-            math.sin(self.camera_pitch),
-            math.cos(self.camera_yaw) * math.cos(self.camera_pitch)
-        ]
-
-        # Normalize
-        length = math.sqrt(sum(f*f for f in forward))
-        if length > 0:
-            forward = [f/length for f in forward]
-
-        return forward
+        """Get camera forward vector (view of the camera basis)"""
+        return self._basis[FORWARD]
 
     def get_camera_right(self):
-        """Get camera right vector"""
-        forward = self.get_camera_forward()
-
-        # Cross with up vector (0, 1, 0)
-        right = [
-            forward[2],  # Simplified cross product
-            0,
-            -forward[0]
-        ]
-
-        # Normalize
-        length = math.sqrt(sum(r*r for r in right))
-        if length > 0:
-            right = [r/length for r in right]
-
-        return right
+        """Get camera right vector (view of the camera basis)"""
+        return self._basis[RIGHT]
@@ -9,6 +9,11 @@ import yaml
 import threading
 from pathlib import Path
 
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
 import kivy
 kivy.require('2.3.0')
 
@@ -25,6 +30,8 @@ from game import GameStateManager
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+WINDOW_ICON_PATH = Path("assets/ui/window_icon.png")
+
 
 class OgreKivyGameClient(BoxLayout):
     """Main container for Ogre3D view and Kivy UI"""
@@ -51,12 +58,13 @@ class OgreKivyGameClient(BoxLayout):
         # Add UI to layout
         self.add_widget(self.ui)
 
-        # Start networking in background thread
-        self.network_thread = threading.Thread(
-            target=self.network_client.connect,
-            daemon=True
-        )
-        self.network_thread.start()
+        # Drain server messages on the main thread only when some arrive
+        self.network_client.on_messages_queued = self.schedule_message_drain
+
+        # Network I/O runs on the Kivy thread: the clock polls the client's
+        # event loop every frame instead of a second Python thread
+        self.network_client.connect_polled()
+        Clock.schedule_interval(self.network_client.poll, 0)
 
         # Start Ogre3D renderer in separate thread
         self.ogre_thread = threading.Thread(
@@ -68,12 +76,17 @@ class OgreKivyGameClient(BoxLayout):
         # Schedule updates
         Clock.schedule_interval(self.update, 1.0 / 60.0)
 
+    def schedule_message_drain(self):
+        """Queue a message drain on the Kivy thread (called from the network thread)"""
+        Clock.schedule_once(self.drain_messages, 0)
+
+    def drain_messages(self, dt):
+        """Apply received server messages to the game state"""
+        self.network_client.process_messages()
+
     def update(self, dt):
         """Main game loop update"""
         if self.network_client.connected:
-            # Process received messages
-            self.network_client.process_messages()
-
             # Update game state
             self.game_state.update(dt)
 
@@ -87,20 +100,22 @@ class OgreKivyGameClient(BoxLayout):
 class GameClientApp(App):
     """Main Kivy Application"""
 
+    # Probed once at import rather than on every build
+    window_icon = str(WINDOW_ICON_PATH) if WINDOW_ICON_PATH.exists() else None
+
     def __init__(self, config, **kwargs):
         super().__init__(**kwargs)
         self.config = config
         self.title = f"Game Client - {config['client']['player_name']}"
 
     def build(self):
-        Window.size = (config['window']['width'], config['window']['height'])
+        Window.size = (self.config['window']['width'], self.config['window']['height'])
         Window.minimum_width = 800
         Window.minimum_height = 600
 
         # Set window icon
-        icon_path = Path("assets/ui/window_icon.png")
-        if icon_path.exists():
-            Window.set_icon(str(icon_path))
+        if self.window_icon:
+            Window.set_icon(self.window_icon)
 
         return OgreKivyGameClient(self.config)
 
@@ -116,7 +131,7 @@ def load_config(config_path="config/client_config.yaml"):
     """Load client configuration"""
     try:
         with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=YamlLoader)
         return config
     except FileNotFoundError:
         # Default configuration
@@ -2,6 +2,7 @@
 Network client for connecting to C++ game server
 """
 
+import asyncio
 import socket
 import json
 import threading
@@ -9,12 +10,34 @@ import time
 import logging
 import struct
 from enum import Enum
-from queue import Queue, Empty
+from collections import deque
 import msgpack
 import zlib
 
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+try:
+    # Compiled sendmmsg batching for UDP (see _net_batch.pyx)
+    from ._net_batch import send_batch, BATCH_LIMIT
+    NET_BATCH_AVAILABLE = True
+except ImportError:
+    NET_BATCH_AVAILABLE = False
+
+from .protocol import decode_json, encode_json
+
 logger = logging.getLogger(__name__)
 
+CONNECT_TIMEOUT = 5.0  # seconds
+HANDLER_TABLE_SIZE = 32  # covers every MessageType value
+RECV_BUFFER_SIZE = 65536  # bytes read per stream wake-up
+SOCKET_BUFFER_SIZE = 262144  # bytes, for both SO_SNDBUF and SO_RCVBUF
+SEND_BATCH_BYTES = 65536  # most bytes joined into one stream write
+QUEUE_CAPACITY = 4096  # queued messages per direction beyond which state updates are dropped
+
 
 class MessageType(Enum):
     """Message types matching C++ server protocol"""
@@ -36,8 +59,55 @@ class MessageType(Enum):
     COLLISION = 16
 
 
+class _DatagramProtocol(asyncio.DatagramProtocol):
+    """UDP callbacks forwarded to a GameNetworkClient"""
+
+    def __init__(self, client):
+        self.client = client
+
+    def datagram_received(self, data, addr):
+        self.client.receive_data(data)
+
+    def error_received(self, exc):
+        logger.error(f"Receive error: {exc}")
+
+    def connection_lost(self, exc):
+        if self.client.running:
+            logger.warning("Connection lost")
+        self.client.connected = False
+
+
+class _StreamProtocol(asyncio.BufferedProtocol):
+    """TCP callbacks that read straight into one preallocated buffer"""
+
+    def __init__(self, client):
+        self.client = client
+        self._read_buffer = memoryview(bytearray(RECV_BUFFER_SIZE))
+
+    def get_buffer(self, sizehint):
+        return self._read_buffer
+
+    def buffer_updated(self, nbytes):
+        self.client.receive_data(self._read_buffer[:nbytes])
+
+    def connection_lost(self, exc):
+        if self.client.running:
+            logger.warning("Connection lost")
+        self.client.connected = False
+
+
+MOVEMENT_TYPE = MessageType.MOVEMENT.value
+
+
 class GameNetworkClient:
-    """TCP/UDP client for game server communication"""
+    """TCP/UDP client for game server communication
+
+    All socket I/O runs on one asyncio event loop (uvloop when installed).
+    connect() runs that loop in a background thread; connect_polled()
+    instead leaves it to the caller to drive with poll(), e.g. once per
+    frame from the UI clock, so no second Python thread competes for the
+    GIL. The public methods are safe to call from the main thread.
+    """
 
     def __init__(self, host, port, game_state, use_udp=False):
         self.host = host
@@ -45,24 +115,37 @@ class GameNetworkClient:
         self.game_state = game_state
         self.use_udp = use_udp
 
-        self.socket = None
+        self.transport = None
         self.connected = False
         self.session_id = 0
         self.player_id = 0
 
-        # Message queues
-        self.outgoing_queue = Queue()
-        self.incoming_queue = Queue()
-
-        # Thread control
+        # Message queues; each has a single producer and a single consumer
+        # thread, so deque append/popleft need no lock. Only movement and
+        # entity state updates, which the next one supersedes, are dropped
+        # when a queue backs up past QUEUE_CAPACITY; the rest is always kept
+        self.outgoing_queue = deque()
+        self.incoming_queue = deque()
+        self._send_ready = None
+        self._receive_buffer = bytearray()
+
+        # Called from the loop thread when incoming messages are waiting;
+        # must be thread-safe, e.g. a Clock.schedule_once wrapper
+        self.on_messages_queued = None
+        self._drain_pending = False
+
+        # Event loop control
         self.running = False
-        self.receive_thread = None
-        self.send_thread = None
+        self.loop = None
+        self.loop_thread = None
+        self._send_task = None
+        self._udp_fd = None
 
         # Connection stats
         self.latency = 0
         self.packets_sent = 0
         self.packets_received = 0
+        self.dropped_updates = 0
 
         # Message handlers
         self.handlers = {
@@ -72,158 +155,307 @@ class GameNetworkClient:
             MessageType.ERROR: self.handle_error,
             MessageType.SUCCESS: self.handle_success,
             MessageType.COLLISION: self.handle_collision,
-            MessageType.NPC_INTERACTION: self.handle_npc_interaction
+            MessageType.NPC_INTERACTION: self.handle_npc_interaction,
+            MessageType.PONG: self.handle_pong
         }
+        self.rebuild_handler_table()
+
+    def rebuild_handler_table(self):
+        """Resolve handlers into a table indexed by raw message type value"""
+        self._handler_table = [None] * HANDLER_TABLE_SIZE
+        for msg_type, handler in self.handlers.items():
+            self._handler_table[msg_type.value] = handler
 
     def connect(self):
-        """Connect to game server"""
+        """Connect to game server, blocking until connected or failed"""
+        self.running = True
+        self.loop = uvloop.new_event_loop() if UVLOOP_AVAILABLE else asyncio.new_event_loop()
+        self.loop_thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.loop_thread.start()
+
         try:
-            if self.use_udp:
-                self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            else:
-                self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                self.socket.settimeout(5.0)
-                self.socket.connect((self.host, self.port))
+            future = asyncio.run_coroutine_threadsafe(self.establish(), self.loop)
+            future.result(timeout=CONNECT_TIMEOUT)
+        except Exception as e:
+            logger.error(f"Connection failed: {e}")
 
-            self.running = True
-            self.connected = True
+        if not self.connected:
+            self.running = False
+            self.stop_loop()
+        return self.connected
+
+    def connect_polled(self):
+        """Start connecting on a loop that the caller drives with poll()"""
+        self.running = True
+        self.loop = uvloop.new_event_loop() if UVLOOP_AVAILABLE else asyncio.new_event_loop()
+        self.loop_thread = None
+        self.loop.create_task(self.establish())
+
+    def poll(self, dt=None):
+        """Run one non-blocking iteration of a polled event loop"""
+        loop = self.loop
+        if loop is None or loop.is_closed() or self.loop_thread is not None:
+            return
+
+        # stop() queued first makes run_forever handle ready I/O and return
+        loop.call_soon(loop.stop)
+        loop.run_forever()
+
+    async def establish(self):
+        """Open the connection and log in (runs on the event loop)"""
+        try:
+            await self.open_connection()
+        except Exception as e:
+            logger.error(f"Connection failed: {e}")
+            self.running = False
+            return
+
+        self.connected = True
 
-            # Start network threads
-            self.receive_thread = threading.Thread(target=self.receive_loop, daemon=True)
-            self.send_thread = threading.Thread(target=self.send_loop, daemon=True)
+        # Send login message
+        self.login()
 
-            self.receive_thread.start()
-            self.send_thread.start()
+        logger.info(f"Connected to {self.host}:{self.port}")
 
-            # Send login message
-            self.login()
+    async def open_connection(self):
+        """Open the transport and start sending (runs on the event loop)"""
+        if self.use_udp:
+            self.transport, _ = await self.loop.create_datagram_endpoint(
+                lambda: _DatagramProtocol(self),
+                remote_addr=(self.host, self.port)
+            )
+            if NET_BATCH_AVAILABLE:
+                self._udp_fd = self.transport.get_extra_info('socket').fileno()
+        else:
+            self.transport, _ = await asyncio.wait_for(
+                self.loop.create_connection(lambda: _StreamProtocol(self), self.host, self.port),
+                CONNECT_TIMEOUT
+            )
 
-            logger.info(f"Connected to {self.host}:{self.port}")
-            return True
+        self.configure_socket(self.transport.get_extra_info('socket'))
 
-        except Exception as e:
-            logger.error(f"Connection failed: {e}")
-            self.connected = False
-            return False
+        self._send_ready = asyncio.Event()
+        self._send_task = self.loop.create_task(self.send_loop())
+
+    def configure_socket(self, sock):
+        """Tune the game socket for small, latency-sensitive messages"""
+        if sock is None:
+            return
+
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_SIZE)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE)
+
+        if not self.use_udp:
+            # Movement updates are tiny; don't let Nagle hold them back
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
 
     def disconnect(self):
         """Disconnect from server"""
+        if self.loop is None:
+            return
+
+        if self.connected:
+            self.send_logout()
+
         self.running = False
         self.connected = False
 
-        if self.socket:
-            try:
-                self.send_logout()
-                self.socket.close()
-            except:
-                pass
+        try:
+            if self.loop_thread is None:
+                self.loop.run_until_complete(self.close_connection())
+            else:
+                future = asyncio.run_coroutine_threadsafe(self.close_connection(), self.loop)
+                future.result(timeout=1.0)
+        except Exception:
+            pass
 
-        if self.receive_thread:
-            self.receive_thread.join(timeout=1.0)
-        if self.send_thread:
-            self.send_thread.join(timeout=1.0)
+        self.stop_loop()
 
         logger.info("Disconnected from server")
 
+    async def close_connection(self):
+        """Flush queued messages and close the transport (runs on the event loop)"""
+        if self._send_task:
+            self._send_task.cancel()
+        self._udp_fd = None
+
+        if self.transport:
+            while self.outgoing_queue:
+                self.write_message(self.outgoing_queue.popleft())
+            self.transport.close()
+
+    def stop_loop(self):
+        """Stop the event loop and wait for its thread"""
+        if self.loop_thread is None:
+            self.loop.close()
+            return
+
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.loop_thread.join(timeout=1.0)
+
+        if not self.loop_thread.is_alive():
+            self.loop.close()
+
     def send_message(self, msg_type, data):
         """Send message to server"""
         message = {
             'type': msg_type.value,
             'data': data,
-            'timestamp': time.time(),
+            'ts_us': time.monotonic_ns() // 1000,
             'session_id': self.session_id,
             'player_id': self.player_id
         }
 
         # Compress if large
-        message_str = json.dumps(message)
-        if len(message_str) > 1024:
-            compressed = zlib.compress(message_str.encode())
-            self.outgoing_queue.put(compressed)
-        else:
-            self.outgoing_queue.put(message_str.encode())
+        message_bytes = encode_json(message)
+        if len(message_bytes) > 1024:
+            message_bytes = zlib.compress(message_bytes)
 
-        self.packets_sent += 1
+        self.enqueue(message_bytes)
 
-    def receive_loop(self):
-        """Receive messages from server"""
-        buffer = b''
+    def enqueue(self, message_bytes, droppable=False):
+        """Queue an encoded message and wake the send loop
 
-        while self.running:
-            try:
-                if self.use_udp:
-                    data, _ = self.socket.recvfrom(65535)
-                else:
-                    data = self.socket.recv(4096)
+        droppable messages are discarded while the queue is backed up.
+        """
+        if self._send_ready is None:
+            return
 
-                if not data:
-                    logger.warning("Connection lost")
-                    self.connected = False
-                    break
+        if droppable and len(self.outgoing_queue) >= QUEUE_CAPACITY:
+            self.drop_update('outgoing')
+            return
 
-                buffer += data
+        self.outgoing_queue.append(message_bytes)
+        self.packets_sent += 1
 
-                # Process complete messages
-                while b'\n' in buffer:
-                    message, buffer = buffer.split(b'\n', 1)
+        # Wake the send loop unless a wake-up is already pending
+        if not self._send_ready.is_set():
+            self.loop.call_soon_threadsafe(self._send_ready.set)
 
-                    # Decompress if needed
-                    try:
-                        if message.startswith(b'x'):
-                            message = zlib.decompress(message)
+    def receive_data(self, data):
+        """Handle bytes received from the server (runs on the event loop)"""
+        buffer = self._receive_buffer
+        buffer.extend(data)
 
-                        self.process_incoming_message(message.decode())
-                    except Exception as e:
-                        logger.error(f"Message processing error: {e}")
+        # Process complete messages
+        start = 0
+        end = buffer.find(b'\n')
+        while end >= 0:
+            message = bytes(buffer[start:end])
+            start = end + 1
 
-                self.packets_received += 1
+            # Decompress if needed
+            try:
+                if message.startswith(b'x'):
+                    message = zlib.decompress(message)
 
-            except socket.timeout:
-                continue
+                self.process_incoming_message(message)
             except Exception as e:
-                logger.error(f"Receive error: {e}")
-                self.connected = False
-                break
+                logger.error(f"Message processing error: {e}")
 
-    def send_loop(self):
-        """Send messages to server"""
-        while self.running:
-            try:
-                message = self.outgoing_queue.get(timeout=0.1)
+            end = buffer.find(b'\n', start)
+
+        # Drop consumed bytes in place
+        del buffer[:start]
+        self.packets_received += 1
+
+        # Wake the main thread once per batch rather than having it poll
+        if self.incoming_queue and not self._drain_pending:
+            callback = self.on_messages_queued
+            if callback is not None:
+                self._drain_pending = True
+                callback()
 
-                if self.use_udp:
-                    self.socket.sendto(message + b'\n', (self.host, self.port))
-                else:
-                    self.socket.sendall(message + b'\n')
+    async def send_loop(self):
+        """Send queued messages to server"""
+        while True:
+            await self._send_ready.wait()
 
-            except Empty:
-                continue
+            # Clear before draining so messages queued meanwhile re-arm the event
+            self._send_ready.clear()
+
+            try:
+                while self.outgoing_queue:
+                    if self._udp_fd is not None:
+                        self.write_datagram_batch()
+                    elif not self.use_udp:
+                        self.write_stream_batch()
+                    else:
+                        self.write_message(self.outgoing_queue.popleft())
             except Exception as e:
+                # Keep the task alive; anything left queued goes out on the
+                # next wakeup
                 logger.error(f"Send error: {e}")
-                break
 
-    def process_incoming_message(self, message_str):
+    def write_message(self, message):
+        """Write one message to the transport"""
+        if self.use_udp:
+            self.transport.sendto(message + b'\n')
+        else:
+            self.transport.write(message + b'\n')
+
+    def write_stream_batch(self):
+        """Join queued messages into one transport write of up to SEND_BATCH_BYTES"""
+        queue = self.outgoing_queue
+        chunks = []
+        size = 0
+        while queue and size < SEND_BATCH_BYTES:
+            message = queue.popleft()
+            chunks.append(message)
+            chunks.append(b'\n')
+            size += len(message) + 1
+
+        self.transport.write(b''.join(chunks))
+
+    def write_datagram_batch(self):
+        """Send up to BATCH_LIMIT queued datagrams with a single syscall"""
+        queue = self.outgoing_queue
+        packets = [queue.popleft() + b'\n' for _ in range(min(len(queue), BATCH_LIMIT))]
+        try:
+            sent = send_batch(self._udp_fd, packets)
+        except OSError as e:
+            # e.g. ECONNREFUSED left behind by an ICMP port unreachable;
+            # the transport reports or retries it on its own terms
+            logger.warning(f"Batched send failed, falling back to transport: {e}")
+            sent = 0
+
+        # Let the transport buffer whatever the kernel did not accept
+        for packet in packets[sent:]:
+            self.transport.sendto(packet)
+
+    def process_incoming_message(self, message_bytes):
         """Process incoming message from server"""
         try:
-            message = json.loads(message_str)
-            msg_type = MessageType(message['type'])
+            message = decode_json(message_bytes)
+            msg_type = message['type']
 
-            if msg_type in self.handlers:
-                self.handlers[msg_type](message['data'])
+            handler = None
+            if type(msg_type) is int and 0 <= msg_type < HANDLER_TABLE_SIZE:
+                handler = self._handler_table[msg_type]
+
+            if handler is not None:
+                handler(message['data'])
             else:
                 logger.warning(f"No handler for message type: {msg_type}")
 
         except json.JSONDecodeError as e:
             logger.error(f"Invalid JSON: {e}")
 
+    def drop_update(self, direction):
+        """Count a discarded state update, logging one in every thousand"""
+        self.dropped_updates += 1
+        if self.dropped_updates % 1000 == 1:
+            logger.warning(
+                f"{direction} queue backed up, dropping state updates "
+                f"({self.dropped_updates} dropped so far)"
+            )
+
     def process_messages(self):
         """Process messages in main thread"""
-        while not self.incoming_queue.empty():
-            try:
-                message = self.incoming_queue.get_nowait()
-                self.game_state.apply_server_update(message)
-            except Empty:
-                break
+        # Clear first so messages queued during the drain schedule another
+        self._drain_pending = False
+        while self.incoming_queue:
+            self.game_state.apply_server_update(self.incoming_queue.popleft())
 
     # Message handlers
     def handle_world_chunk(self, data):
@@ -232,7 +464,7 @@ class GameNetworkClient:
         chunk_z = data['chunk_z']
         chunk_data = data['data']
 
-        self.incoming_queue.put({
+        self.incoming_queue.append({
             'type': 'world_chunk',
             'chunk_x': chunk_x,
             'chunk_z': chunk_z,
@@ -241,14 +473,18 @@ class GameNetworkClient:
 
     def handle_entity_update(self, data):
         """Handle entity updates"""
-        self.incoming_queue.put({
+        if len(self.incoming_queue) >= QUEUE_CAPACITY:
+            self.drop_update('incoming')
+            return
+
+        self.incoming_queue.append({
             'type': 'entity_update',
             'entities': data['entities']
         })
 
     def handle_chat(self, data):
         """Handle chat messages"""
-        self.incoming_queue.put({
+        self.incoming_queue.append({
             'type': 'chat',
             'sender': data['sender'],
             'message': data['message'],
@@ -259,6 +495,12 @@ class GameNetworkClient:
         """Handle error messages"""
         logger.error(f"Server error: {data['message']} (code: {data['code']})")
 
+    def handle_pong(self, data):
+        """Measure round trip time from an echoed ping"""
+        sent_us = data.get('ts_us')
+        if sent_us is not None:
+            self.latency = (time.monotonic_ns() // 1000 - sent_us) / 1000.0
+
     def handle_success(self, data):
         """Handle success messages"""
         logger.info(f"Success: {data['message']}")
@@ -270,7 +512,7 @@ class GameNetworkClient:
 
     def handle_collision(self, data):
         """Handle collision events"""
-        self.incoming_queue.put({
+        self.incoming_queue.append({
             'type': 'collision',
             'entity1': data['entity1'],
             'entity2': data['entity2'],
@@ -279,7 +521,7 @@ class GameNetworkClient:
 
     def handle_npc_interaction(self, data):
         """Handle NPC interactions"""
-        self.incoming_queue.put({
+        self.incoming_queue.append({
             'type': 'npc_interaction',
             'npc_id': data['npc_id'],
             'interaction_type': data['interaction_type'],
@@ -302,13 +544,21 @@ class GameNetworkClient:
 
     def send_movement(self, position, rotation, velocity):
         """Send player movement update"""
-        movement_data = {
-            'position': position,
-            'rotation': rotation,
-            'velocity': velocity,
-            'timestamp': time.time()
-        }
-        self.send_message(MessageType.MOVEMENT, movement_data)
+        # Sent every frame: build the envelope in one go and skip the
+        # compression check, movement is far below its threshold
+        ts_us = time.monotonic_ns() // 1000
+        self.enqueue(encode_json({
+            'type': MOVEMENT_TYPE,
+            'data': {
+                'position': position,
+                'rotation': rotation,
+                'velocity': velocity,
+                'ts_us': ts_us
+            },
+            'ts_us': ts_us,
+            'session_id': self.session_id,
+            'player_id': self.player_id
+        }), droppable=True)
 
     def send_chat(self, message, channel='global'):
         """Send chat message"""
@@ -337,4 +587,4 @@ class GameNetworkClient:
 
     def ping(self):
         """Send ping to measure latency"""
-        self.send_message(MessageType.PING, {'timestamp': time.time()})
+        self.send_message(MessageType.PING, {'ts_us': time.monotonic_ns() // 1000})
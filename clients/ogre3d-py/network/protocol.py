@@ -6,6 +6,54 @@ import json
 from enum import IntEnum
 from typing import Dict, Any, Optional
 import struct
+import time
+
+import msgpack
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# MessageHeader.flags bits
+FLAG_MSGPACK = 0x04  # payload is MessagePack, not JSON
+
+# Message header: type, payload size, session id, flags
+_HDR = struct.Struct('!HIII')
+
+
+def encode_json(obj) -> bytes:
+    """Encode an object as compact JSON bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+def decode_json(data):
+    """Decode JSON from bytes or str (raises json.JSONDecodeError)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Protocol messages are encoded on the network thread only, so one packer
+# and its buffer can be shared by every call
+_packer = msgpack.Packer(autoreset=False, use_bin_type=True)
+
+
+def encode_msgpack(obj) -> bytes:
+    """Encode an object as MessagePack bytes"""
+    _packer.pack(obj)
+    data = _packer.bytes()
+    _packer.reset()
+    return data
+
+
+def decode_msgpack(data):
+    """Decode MessagePack bytes (arrays come back as tuples)"""
+    return msgpack.unpackb(data, raw=False, use_list=False)
 
 
 class MessageType(IntEnum):
@@ -38,11 +86,21 @@ class MessageType(IntEnum):
     PONG = 0x8B
 
 
+# Plain int type values for the builders; MessageType is kept for repr
+_MT_LOGIN = MessageType.LOGIN_REQUEST.value
+_MT_MOVEMENT = MessageType.MOVEMENT_UPDATE.value
+_MT_CHAT = MessageType.CHAT_MESSAGE.value
+_MT_WORLD_REQUEST = MessageType.WORLD_REQUEST.value
+_MT_ENTITY_INTERACT = MessageType.ENTITY_INTERACT.value
+_MT_COMBAT_ACTION = MessageType.COMBAT_ACTION.value
+_MT_PING = MessageType.PING.value
+
+
 class MessageHeader:
     """Message header structure"""
-    SIZE = 12  # bytes
+    SIZE = _HDR.size  # 14 bytes
 
-    def __init__(self, msg_type: MessageType, size: int,
+    def __init__(self, msg_type: int, size: int,
                  session_id: int = 0, flags: int = 0):
         self.msg_type = msg_type
         self.size = size
@@ -51,17 +109,14 @@ class MessageHeader:
 
     def pack(self) -> bytes:
         """Pack header to bytes"""
-        return struct.pack('!HIII',
-                          self.msg_type.value,
-                          self.size,
-                          self.session_id,
-                          self.flags)
+        return _HDR.pack(self.msg_type, self.size, self.session_id, self.flags)
 
     @classmethod
-    def unpack(cls, data: bytes) -> 'MessageHeader':
-        """Unpack header from bytes"""
-        msg_type_val, size, session_id, flags = struct.unpack('!HIII', data)
-        return cls(MessageType(msg_type_val), size, session_id, flags)
+    def unpack(cls, data, offset: int = 0) -> 'MessageHeader':
+        """Unpack header from any buffer without copying it"""
+        # Keep the raw type value; MessageType is only needed for display
+        msg_type_val, size, session_id, flags = _HDR.unpack_from(data, offset)
+        return cls(msg_type_val, size, session_id, flags)
 
 
 class GameMessage:
@@ -70,23 +125,28 @@ class GameMessage:
     def __init__(self, msg_type: MessageType,
                  data: Dict[str, Any] = None,
                  session_id: int = 0):
-        self.msg_type = msg_type
+        self.msg_type = int(msg_type)
         self.data = data or {}
         self.session_id = session_id
         self.timestamp = 0
         self.sequence = 0
 
-    def serialize(self) -> bytes:
+    def serialize(self, use_msgpack: bool = False) -> bytes:
         """Serialize message to bytes"""
-        # Convert data to JSON
-        json_data = json.dumps(self.data, separators=(',', ':'))
-        json_bytes = json_data.encode('utf-8')
+        if use_msgpack:
+            json_bytes = encode_msgpack(self.data)
+            flags = FLAG_MSGPACK
+        else:
+            # Convert data to JSON
+            json_bytes = encode_json(self.data)
+            flags = 0
 
         # Create header
         header = MessageHeader(
             msg_type=self.msg_type,
             size=len(json_bytes),
-            session_id=self.session_id
+            session_id=self.session_id,
+            flags=flags
         )
 
         # Combine header and data
@@ -99,7 +159,7 @@ class GameMessage:
             return None
 
         # Parse header
-        header = MessageHeader.unpack(data[:MessageHeader.SIZE])
+        header = MessageHeader.unpack(data)
 
         if len(data) < MessageHeader.SIZE + header.size:
             return None
@@ -108,8 +168,11 @@ class GameMessage:
         json_data = data[MessageHeader.SIZE:MessageHeader.SIZE + header.size]
 
         try:
-            data_dict = json.loads(json_data.decode('utf-8'))
-        except json.JSONDecodeError:
+            if header.flags & FLAG_MSGPACK:
+                data_dict = decode_msgpack(json_data)
+            else:
+                data_dict = decode_json(json_data)
+        except ValueError:  # JSONDecodeError and msgpack's errors
             return None
 
         # Create message
@@ -122,7 +185,11 @@ class GameMessage:
         return message
 
     def __repr__(self) -> str:
-        return f"GameMessage(type={self.msg_type.name}, data={self.data})"
+        try:
+            type_name = MessageType(self.msg_type).name
+        except ValueError:
+            type_name = str(self.msg_type)
+        return f"GameMessage(type={type_name}, data={self.data})"
 
 
 # Message builders
@@ -134,7 +201,7 @@ class MessageBuilder:
               version: str = "1.0.0") -> GameMessage:
         """Build login request message"""
         return GameMessage(
-            msg_type=MessageType.LOGIN_REQUEST,
+            msg_type=_MT_LOGIN,
             data={
                 'player_name': player_name,
                 'auth_token': auth_token,
@@ -148,13 +215,13 @@ class MessageBuilder:
                  velocity: list, flags: int = 0) -> GameMessage:
         """Build movement update message"""
         return GameMessage(
-            msg_type=MessageType.MOVEMENT_UPDATE,
+            msg_type=_MT_MOVEMENT,
             data={
                 'position': position,
                 'rotation': rotation,
                 'velocity': velocity,
                 'flags': flags,
-                'timestamp': 0  # Will be set by network layer
+                'ts_us': time.monotonic_ns() // 1000
             }
         )
 
@@ -163,7 +230,7 @@ class MessageBuilder:
              target: str = "") -> GameMessage:
         """Build chat message"""
         return GameMessage(
-            msg_type=MessageType.CHAT_MESSAGE,
+            msg_type=_MT_CHAT,
             data={
                 'message': message,
                 'channel': channel,
@@ -177,7 +244,7 @@ class MessageBuilder:
                      lod: int = 0) -> GameMessage:
         """Build world chunk request"""
         return GameMessage(
-            msg_type=MessageType.WORLD_REQUEST,
+            msg_type=_MT_WORLD_REQUEST,
             data={
                 'chunk_x': chunk_x,
                 'chunk_z': chunk_z,
@@ -192,7 +259,7 @@ class MessageBuilder:
                           data: Dict = None) -> GameMessage:
         """Build entity interaction message"""
         return GameMessage(
-            msg_type=MessageType.ENTITY_INTERACT,
+            msg_type=_MT_ENTITY_INTERACT,
             data={
                 'entity_id': entity_id,
                 'interaction_type': interaction_type,
@@ -206,7 +273,7 @@ class MessageBuilder:
                      position: list = None) -> GameMessage:
         """Build combat action message"""
         return GameMessage(
-            msg_type=MessageType.COMBAT_ACTION,
+            msg_type=_MT_COMBAT_ACTION,
             data={
                 'target_id': target_id,
                 'action_type': action_type,
@@ -219,8 +286,8 @@ class MessageBuilder:
     def ping() -> GameMessage:
         """Build ping message"""
         return GameMessage(
-            msg_type=MessageType.PING,
-            data={'timestamp': 0}
+            msg_type=_MT_PING,
+            data={'ts_us': time.monotonic_ns() // 1000}
         )
 
 
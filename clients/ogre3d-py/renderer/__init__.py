@@ -3,25 +3,135 @@ Ogre3D renderer for 3D game world
 """
 
 import threading
-import queue
 import time
 import math
 import logging
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
+from collections import deque
+
+import numpy as np
+
+from game import pack_chunk_key, unpack_chunk_key
+
+# Ogre and OIS are large extension modules; they are imported by
+# _ensure_ogre() the first time the renderer actually starts
+ogre = None
+OIS = None
+OGRE_AVAILABLE = False
 
 try:
-    import ogre.renderer.OGRE as ogre
-    import ogre.io.OIS as OIS
-    OGRE_AVAILABLE = True
+    from ._terrain_numba import build_terrain, compute_normals
+    NUMBA_AVAILABLE = True
 except ImportError:
-    OGRE_AVAILABLE = False
-    logging.warning("Ogre3D not available, using dummy renderer")
+    NUMBA_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
-
-@dataclass
+RENDER_QUEUE_CAPACITY = 8192  # commands; the oldest are dropped beyond this
+SYNC_EPSILON = 1e-4  # smallest transform change worth sending to the renderer
+CAMERA_SMOOTHING = 0.1  # fraction of the gap to the player closed per frame
+CAMERA_MIN_STEP_SQ = 1e-6  # squared step below which the camera holds still
+
+# Common meshes loaded before the first frame
+PRELOAD_MESHES = (
+    "player.mesh",
+    "npc.mesh",
+    "tree.mesh",
+    "rock.mesh",
+    "building.mesh",
+)
+
+# Interleaved terrain vertex layout, matching the declaration built in
+# create_chunk_terrain
+TERRAIN_VERTEX_DTYPE = np.dtype([
+    ('pos', '<f4', 3),
+    ('uv', '<f4', 2),
+    ('normal', '<f4', 3),
+])
+
+
+def _ensure_ogre():
+    """Import Ogre3D on first use; returns whether it is available"""
+    global ogre, OIS, OGRE_AVAILABLE
+    if ogre is None:
+        try:
+            import ogre.renderer.OGRE as ogre_module
+            import ogre.io.OIS as ois_module
+        except ImportError:
+            logger.warning("Ogre3D not available, using dummy renderer")
+            return False
+        ogre, OIS = ogre_module, ois_module
+        OGRE_AVAILABLE = True
+    return OGRE_AVAILABLE
+
+
+def _as_tuple(values):
+    """Detach a position/rotation (list or NumPy row) as a tuple of floats"""
+    if isinstance(values, np.ndarray):
+        return tuple(values.tolist())
+    return tuple(values)
+
+
+def _changed(old, new, eps=SYNC_EPSILON):
+    """Whether any component moved by more than eps"""
+    if old is None or len(old) != len(new):
+        return True
+    for a, b in zip(old, new):
+        if abs(a - b) > eps:
+            return True
+    return False
+
+
+def terrain_normals(heights, scale=1.0):
+    """Per-vertex normals of a float32 heightmap as an (N, 3) array
+
+    Uses central differences of neighbouring heights, replicating the
+    border rows and columns.
+    """
+    if NUMBA_AVAILABLE:
+        return compute_normals(heights, np.float32(scale))
+
+    padded = np.pad(heights, 1, mode='edge')
+    inv_span = 1.0 / (2.0 * scale)
+    normals = np.empty(heights.shape + (3,), dtype=np.float32)
+    normals[..., 0] = (padded[1:-1, :-2] - padded[1:-1, 2:]) * inv_span
+    normals[..., 1] = 1.0
+    normals[..., 2] = (padded[:-2, 1:-1] - padded[2:, 1:-1]) * inv_span
+    normals /= np.linalg.norm(normals, axis=-1, keepdims=True)
+    return normals.reshape(-1, 3)
+
+
+def build_terrain_mesh(heightmap, scale=1.0):
+    """Build vertex positions, texture coordinates and triangle indices
+    for a square heightmap grid
+
+    Returns (positions (N, 3) float32, uvs (N, 2) float32,
+    indices (M, 3) uint32).
+    """
+    heights = np.asarray(heightmap, dtype=np.float32)
+    if NUMBA_AVAILABLE:
+        return build_terrain(heights, np.float32(scale))
+
+    size = heights.shape[0]
+
+    axis = np.arange(size, dtype=np.float32)
+    xs, zs = np.meshgrid(axis, axis)
+
+    positions = np.stack([xs * scale, heights, zs * scale], axis=-1).reshape(-1, 3)
+    uvs = np.stack([xs, zs], axis=-1).reshape(-1, 2) / max(size - 1, 1)
+
+    # Top-left vertex of every grid cell, two triangles per cell
+    cells = (np.arange(size - 1)[:, None] * size + np.arange(size - 1)[None, :]).ravel()
+    indices = np.stack([
+        cells, cells + 1, cells + size,
+        cells + 1, cells + size + 1, cells + size
+    ], axis=-1).astype(np.uint32).reshape(-1, 3)
+
+    return positions, uvs, indices
+
+
+@dataclass(slots=True)
 class EntityData:
     """Entity data for rendering"""
     entity_id: int
@@ -36,18 +146,23 @@ class EntityData:
     animation_speed: float = 1.0
 
 
-@dataclass
+@dataclass(slots=True)
 class ChunkData:
     """World chunk data"""
     chunk_x: int
     chunk_z: int
-    terrain_data: List[List[float]]
+    terrain_data: np.ndarray  # float32 heightmap, empty when flat
     entities: List[EntityData]
     loaded: bool = False
 
 
 class Ogre3DRenderer:
-    """Ogre3D rendering engine"""
+    """Ogre3D rendering engine
+
+    sync_state (UI thread) is the only producer of render_queue and
+    process_render_queue (render thread) its only consumer; deque
+    append/popleft are atomic, so the queue needs no lock.
+    """
 
     def __init__(self, game_state, config):
         self.game_state = game_state
@@ -64,18 +179,43 @@ class Ogre3DRenderer:
 
         # Scene objects
         self.entities: Dict[int, ogre.Entity] = {}
-        self.chunks: Dict[str, ChunkData] = {}
+        # Scene node of each entity, so updates skip Ogre's by-name lookup
+        self.entity_nodes: Dict[int, ogre.SceneNode] = {}
+        self.chunks: Dict[int, ChunkData] = {}  # keyed by pack_chunk_key
         self.player_node = None
+        self.camera_node = None
 
         # Rendering queue
-        self.render_queue = queue.Queue()
+        self.render_queue = deque(maxlen=RENDER_QUEUE_CAPACITY)
+
+        # Render command handlers by command type; each unpacks its own
+        # fields from the command dict
+        self._dispatch = {
+            'create_entity': self._do_create,
+            'update_entity': self._do_update,
+            'remove_entity': self._do_remove,
+            'load_chunk': self._do_load_chunk,
+            'resync': self._do_resync,
+        }
 
-        # Camera settings
-        self.camera_position = ogre.Vector3(0, 10, 20)
-        self.camera_target = ogre.Vector3(0, 0, 0)
+        # Transforms last queued by sync_state, by entity id; only changes
+        # are queued (owned by the sync_state thread)
+        self._last_sent: Dict[int, Tuple[tuple, tuple]] = {}
+        self._last_player_pos = None
+        # Entities hidden for being beyond render_distance of the player
+        self._culled = set()
+
+        # Camera settings (vectors are created once Ogre is loaded)
+        self.camera_position = None
+        self.camera_target = None
         self.camera_yaw = 0.0
         self.camera_pitch = 0.0
 
+        # Scratch values reused by the render thread; Ogre copies them
+        # on every setter, so they can be refilled call after call
+        self._scratch_vec = None
+        self._scratch_quat = None
+
         # Input state
         self.input_manager = None
         self.keyboard = None
@@ -86,7 +226,7 @@ class Ogre3DRenderer:
 
     def run(self):
         """Main render loop"""
-        if not OGRE_AVAILABLE:
+        if not _ensure_ogre():
             logger.error("Ogre3D is not available")
             return
 
@@ -98,22 +238,51 @@ class Ogre3DRenderer:
 
             self.running = True
 
+            # With vsync renderOneFrame already blocks on the buffer swap;
+            # otherwise pace frames against the monotonic clock
+            vsync = self.config['client']['vsync']
+            frame_time = 1.0 / self.config['client'].get('target_fps', 60)
+            next_frame = time.monotonic()
+
             # Main render loop
             while self.running:
                 self.process_render_queue()
                 self.update_camera()
                 self.root.renderOneFrame()
-                time.sleep(1.0 / 60.0)  # 60 FPS
+
+                if not vsync:
+                    next_frame += frame_time
+                    self.wait_until(next_frame)
+                    # Don't try to catch up on frames missed by a stall
+                    next_frame = max(next_frame, time.monotonic() - frame_time)
 
         except Exception as e:
-            logger.error(f"Ogre3D renderer error: {e}")
+            logger.error("Ogre3D renderer error: %s", e)
             import traceback
             traceback.print_exc()
         finally:
             self.shutdown()
 
+    @staticmethod
+    def wait_until(deadline):
+        """Sleep until deadline
+
+        A plain sleep may overshoot by about a millisecond, which does not
+        matter at 60 fps; spinning instead would hold the GIL the network
+        and UI threads need.
+        """
+        time.sleep(max(0.0, deadline - time.monotonic()))
+
     def initialize_ogre(self):
         """Initialize Ogre3D engine"""
+        if not _ensure_ogre():
+            raise RuntimeError("Ogre3D is not available")
+
+        self.camera_position = ogre.Vector3(0, 10, 20)
+        self.camera_target = ogre.Vector3(0, 0, 0)
+        self._scratch_vec = ogre.Vector3(0, 0, 0)
+        self._scratch_quat = ogre.Quaternion(1, 0, 0, 0)
+
         # Create root
         self.root = ogre.Root(
             self.config['ogre']['plugins_path'],
@@ -195,20 +364,14 @@ class Ogre3DRenderer:
 
     def load_resources(self):
         """Load game resources"""
-        # Preload common meshes
-        meshes_to_preload = [
-            "player.mesh",
-            "npc.mesh",
-            "tree.mesh",
-            "rock.mesh",
-            "building.mesh"
-        ]
-
-        for mesh in meshes_to_preload:
+        # Ogre's resource managers are only safe off the render thread in
+        # builds with OGRE_THREAD_SUPPORT, so meshes load here in turn
+        mesh_manager = ogre.MeshManager.getSingleton()
+        for mesh in PRELOAD_MESHES:
             try:
-                ogre.MeshManager.getSingleton().load(mesh, "General")
-            except:
-                logger.warning(f"Could not load mesh: {mesh}")
+                mesh_manager.load(mesh, "General")
+            except Exception:
+                logger.warning("Could not load mesh: %s", mesh)
 
     def setup_scene(self):
         """Setup initial scene"""
@@ -228,6 +391,8 @@ class Ogre3DRenderer:
             "PlayerNode",
             ogre.Vector3(0, 5, 0)
         )
+        # Player updates are queued as entity 0
+        self.entity_nodes[0] = self.player_node
 
         # Position camera behind player
         camera_node = self.player_node.createChildSceneNode(
@@ -235,6 +400,12 @@ class Ogre3DRenderer:
             ogre.Vector3(0, 2, 5)
         )
         camera_node.attachObject(self.camera)
+        self.camera_node = camera_node
+
+        # Camera follow state, mirrored in NumPy to avoid Vector3 math
+        self._camera_pos = np.array((0.0, 2.0, 5.0), dtype=np.float32)
+        self._player_pos = np.zeros(3, dtype=np.float32)
+        self._look_target = np.full(3, np.nan, dtype=np.float32)
 
         logger.info("Scene setup complete")
 
@@ -266,7 +437,7 @@ class Ogre3DRenderer:
             terrain_node.attachObject(terrain)
 
         except Exception as e:
-            logger.error(f"Failed to create terrain: {e}")
+            logger.error("Failed to create terrain: %s", e)
 
     def setup_input(self):
         """Setup input handling"""
@@ -275,44 +446,124 @@ class Ogre3DRenderer:
         pass
 
     def process_render_queue(self):
-        """Process render commands from queue"""
-        try:
-            while True:
-                command = self.render_queue.get_nowait()
+        """Process render commands from queue
+
+        Entity commands are folded per entity first, so each entity gets
+        at most one remove, create and update per frame however many
+        syncs queued commands for it.
+        """
+        render_queue = self.render_queue
+        commands = []
+        # sync_state may clear the queue concurrently, so pop until empty
+        # rather than trusting a length check
+        while True:
+            try:
+                commands.append(render_queue.popleft())
+            except IndexError:
+                break
+
+        if not commands:
+            return
+
+        pending_remove = set()
+        pending_create = {}
+        latest_update = {}
+        for command in commands:
+            cmd_type = command.get('type')
+            entity_id = command.get('entity_id')
+
+            if cmd_type == 'update_entity':
+                # Later values win; None leaves a field unchanged
+                update = latest_update.setdefault(entity_id, {'type': cmd_type})
+                for key, value in command.items():
+                    if value is not None:
+                        update[key] = value
+            elif cmd_type == 'create_entity':
+                # create_entity replaces any existing entity itself
+                pending_remove.discard(entity_id)
+                latest_update.pop(entity_id, None)
+                pending_create[entity_id] = command
+            elif cmd_type == 'remove_entity':
+                pending_create.pop(entity_id, None)
+                latest_update.pop(entity_id, None)
+                pending_remove.add(entity_id)
+            elif cmd_type == 'resync':
+                # A full snapshot supersedes everything queued before it
+                pending_remove.clear()
+                pending_create.clear()
+                latest_update.clear()
+                self.execute_render_command(command)
+            else:
                 self.execute_render_command(command)
-        except queue.Empty:
-            pass
+
+        for entity_id in pending_remove:
+            self.remove_entity(entity_id)
+        for command in pending_create.values():
+            self.execute_render_command(command)
+        for command in latest_update.values():
+            self.execute_render_command(command)
 
     def execute_render_command(self, command):
         """Execute a render command"""
-        cmd_type = command.get('type')
-
-        if cmd_type == 'create_entity':
-            self.create_entity(
-                command['entity_id'],
-                command['mesh'],
-                command['position'],
-                command['rotation'],
-                command.get('scale', (1, 1, 1))
-            )
+        handler = self._dispatch.get(command.get('type'))
+        if handler:
+            handler(command)
+
+    def _do_create(self, command):
+        self.create_entity(
+            command['entity_id'],
+            command['mesh'],
+            command['position'],
+            command['rotation'],
+            command.get('scale', (1, 1, 1))
+        )
 
-        elif cmd_type == 'update_entity':
-            self.update_entity(
-                command['entity_id'],
-                command.get('position'),
-                command.get('rotation'),
-                command.get('visible')
-            )
+    def _do_update(self, command):
+        self.update_entity(
+            command['entity_id'],
+            command.get('position'),
+            command.get('rotation'),
+            command.get('visible')
+        )
 
-        elif cmd_type == 'remove_entity':
-            self.remove_entity(command['entity_id'])
+    def _do_remove(self, command):
+        self.remove_entity(command['entity_id'])
 
-        elif cmd_type == 'load_chunk':
-            self.load_chunk(
-                command['chunk_x'],
-                command['chunk_z'],
-                command.get('terrain_data')
-            )
+    def _do_load_chunk(self, command):
+        self.load_chunk(
+            command['chunk_x'],
+            command['chunk_z'],
+            command.get('terrain_data')
+        )
+
+    def _do_resync(self, command):
+        self.resync_entities(command['entities'])
+
+    def resync_entities(self, snapshot):
+        """Match the scene to a full {entity_id: (mesh, position, rotation)} snapshot"""
+        for entity_id in list(self.entities):
+            if entity_id not in snapshot:
+                self.remove_entity(entity_id)
+
+        # Everything in the snapshot is shown; sync_state forgets what it
+        # culled when it queues a resync and hides out-of-range entities again
+        for entity_id, (mesh, position, rotation) in snapshot.items():
+            if entity_id in self.entities:
+                self.update_entity(entity_id, position, rotation, visible=True)
+            else:
+                self.create_entity(entity_id, mesh, position, rotation)
+
+    def scratch_vector(self, values):
+        """Load x, y, z into the shared scratch Vector3"""
+        vec = self._scratch_vec
+        vec.x, vec.y, vec.z = values[0], values[1], values[2]
+        return vec
+
+    def scratch_quaternion(self, rotation):
+        """Load an (x, y, z, w) rotation into the shared scratch Quaternion"""
+        quat = self._scratch_quat
+        quat.x, quat.y, quat.z, quat.w = rotation[0], rotation[1], rotation[2], rotation[3]
+        return quat
 
     def create_entity(self, entity_id, mesh_name, position, rotation, scale=(1, 1, 1)):
         """Create a new entity"""
@@ -327,7 +578,7 @@ class Ogre3DRenderer:
 
             entity_node = self.scene_manager.getRootSceneNode().createChildSceneNode(
                 f"EntityNode_{entity_id}",
-                ogre.Vector3(*position)
+                self.scratch_vector(position)
             )
 
             entity_node.attachObject(entity)
@@ -335,29 +586,29 @@ class Ogre3DRenderer:
 
             # Apply rotation (quaternion: x, y, z, w)
             if len(rotation) == 4:
-                entity_node.setOrientation(ogre.Quaternion(*rotation))
+                entity_node.setOrientation(self.scratch_quaternion(rotation))
             elif len(rotation) == 3:
                 entity_node.yaw(ogre.Degree(rotation[1]))
                 entity_node.pitch(ogre.Degree(rotation[0]))
                 entity_node.roll(ogre.Degree(rotation[2]))
 
             self.entities[entity_id] = entity
+            self.entity_nodes[entity_id] = entity_node
 
         except Exception as e:
-            logger.error(f"Failed to create entity {entity_id}: {e}")
+            logger.error("Failed to create entity %s: %s", entity_id, e)
 
     def update_entity(self, entity_id, position=None, rotation=None, visible=None):
         """Update entity properties"""
-        node_name = f"EntityNode_{entity_id}"
-        node = self.scene_manager.getSceneNode(node_name)
+        node = self.entity_nodes.get(entity_id)
 
         if node:
             if position:
-                node.setPosition(ogre.Vector3(*position))
+                node.setPosition(self.scratch_vector(position))
 
             if rotation:
                 if len(rotation) == 4:
-                    node.setOrientation(ogre.Quaternion(*rotation))
+                    node.setOrientation(self.scratch_quaternion(rotation))
                 elif len(rotation) == 3:
                     node.setOrientation(ogre.Quaternion(
                         ogre.Degree(rotation[0]),
@@ -376,7 +627,7 @@ class Ogre3DRenderer:
         if entity_id in self.entities:
             try:
                 entity = self.entities[entity_id]
-                node = entity.getParentSceneNode()
+                node = self.entity_nodes.pop(entity_id, None)
 
                 if node:
                     node.detachObject(entity)
@@ -386,16 +637,19 @@ class Ogre3DRenderer:
                 del self.entities[entity_id]
 
             except Exception as e:
-                logger.error(f"Failed to remove entity {entity_id}: {e}")
+                logger.error("Failed to remove entity %s: %s", entity_id, e)
 
     def load_chunk(self, chunk_x, chunk_z, terrain_data=None):
         """Load a world chunk"""
-        chunk_key = f"{chunk_x}_{chunk_z}"
+        chunk_key = pack_chunk_key(chunk_x, chunk_z)
 
         if chunk_key in self.chunks:
             return
 
-        chunk = ChunkData(chunk_x, chunk_z, terrain_data or [], [])
+        heights = np.asarray(
+            terrain_data if terrain_data is not None else (), dtype=np.float32
+        )
+        chunk = ChunkData(chunk_x, chunk_z, heights, [])
         self.chunks[chunk_key] = chunk
 
         # Create chunk node
@@ -405,121 +659,220 @@ class Ogre3DRenderer:
         )
 
         # Create terrain for chunk
-        if terrain_data:
-            self.create_chunk_terrain(chunk_node, terrain_data)
+        if heights.size:
+            self.create_chunk_terrain(chunk_node, heights)
 
         chunk.loaded = True
-        logger.info(f"Loaded chunk {chunk_x},{chunk_z}")
+        logger.info("Loaded chunk %s,%s", chunk_x, chunk_z)
 
     def create_chunk_terrain(self, parent_node, heightmap):
-        """Create terrain from heightmap data"""
+        """Create terrain from heightmap data
+
+        The vertex and index data are written to hardware buffers in one
+        call each rather than vertex by vertex.
+        """
         try:
-            terrain_manual = self.scene_manager.createManualObject(
-                f"Terrain_{parent_node.getName()}"
+            heights = np.asarray(heightmap, dtype=np.float32)
+            positions, uvs, indices = build_terrain_mesh(heights)
+
+            vertices = np.empty(len(positions), dtype=TERRAIN_VERTEX_DTYPE)
+            vertices['pos'] = positions
+            vertices['uv'] = uvs
+            vertices['normal'] = terrain_normals(heights)
+            indices = np.ascontiguousarray(indices.ravel(), dtype=np.uint32)
+
+            mesh_name = f"Terrain_{parent_node.getName()}"
+            mesh = ogre.MeshManager.getSingleton().createManual(mesh_name, "General")
+            buffer_manager = ogre.HardwareBufferManager.getSingleton()
+
+            vertex_data = ogre.VertexData()
+            vertex_data.vertexCount = len(vertices)
+            decl = vertex_data.vertexDeclaration
+            decl.addElement(0, TERRAIN_VERTEX_DTYPE.fields['pos'][1],
+                            ogre.VET_FLOAT3, ogre.VES_POSITION)
+            decl.addElement(0, TERRAIN_VERTEX_DTYPE.fields['uv'][1],
+                            ogre.VET_FLOAT2, ogre.VES_TEXTURE_COORDINATES, 0)
+            decl.addElement(0, TERRAIN_VERTEX_DTYPE.fields['normal'][1],
+                            ogre.VET_FLOAT3, ogre.VES_NORMAL)
+
+            vertex_buffer = buffer_manager.createVertexBuffer(
+                TERRAIN_VERTEX_DTYPE.itemsize, len(vertices),
+                ogre.HardwareBuffer.HBU_STATIC_WRITE_ONLY
             )
+            vertex_buffer.writeData(0, vertices.nbytes, vertices.ctypes.data, True)
+            vertex_data.vertexBufferBinding.setBinding(0, vertex_buffer)
+            mesh.sharedVertexData = vertex_data
 
-            terrain_manual.begin("TerrainMaterial", ogre.RenderOperation.OT_TRIANGLE_LIST)
-
-            size = len(heightmap)
-            scale = 1.0
-
-            # Generate vertices
-            for z in range(size):
-                for x in range(size):
-                    height = heightmap[z][x] if heightmap else 0
-                    terrain_manual.position(x * scale, height, z * scale)
-                    terrain_manual.textureCoord(x / (size-1), z / (size-1))
-                    terrain_manual.normal(0, 1, 0)  # Simple normals
-
-            # Generate indices
-            for z in range(size-1):
-                for x in range(size-1):
-                    idx = z * size + x
-
-                    # First triangle
-                    terrain_manual.index(idx)
-                    terrain_manual.index(idx + 1)
-                    terrain_manual.index(idx + size)
+            index_buffer = buffer_manager.createIndexBuffer(
+                ogre.HardwareIndexBuffer.IT_32BIT, len(indices),
+                ogre.HardwareBuffer.HBU_STATIC_WRITE_ONLY
+            )
+            index_buffer.writeData(0, indices.nbytes, indices.ctypes.data, True)
 
-                    # Second triangle
-                    terrain_manual.index(idx + 1)
-                    terrain_manual.index(idx + size + 1)
-                    terrain_manual.index(idx + size)
+            sub_mesh = mesh.createSubMesh()
+            sub_mesh.useSharedVertices = True
+            sub_mesh.indexData.indexBuffer = index_buffer
+            sub_mesh.indexData.indexStart = 0
+            sub_mesh.indexData.indexCount = len(indices)
+            sub_mesh.setMaterialName("TerrainMaterial")
 
-            terrain_manual.end()
+            low = positions.min(axis=0).tolist()
+            high = positions.max(axis=0).tolist()
+            mesh._setBounds(ogre.AxisAlignedBox(ogre.Vector3(*low), ogre.Vector3(*high)))
+            mesh.load()
 
-            parent_node.attachObject(terrain_manual)
+            parent_node.attachObject(self.scene_manager.createEntity(mesh_name))
 
         except Exception as e:
-            logger.error(f"Failed to create chunk terrain: {e}")
+            logger.error("Failed to create chunk terrain: %s", e)
 
     def update_camera(self):
         """Update camera position and orientation"""
-        if self.player_node and self.camera:
-            # Get camera node
-            camera_node = self.camera.getParentSceneNode()
+        camera_node = self.camera_node
+        if camera_node is None:
+            return
 
-            if camera_node:
-                # Smooth camera follow
-                player_pos = self.player_node.getPosition()
-                camera_target = camera_node.getPosition()
+        # Smooth camera follow
+        player = self.player_node.getPosition()
+        player_pos = self._player_pos
+        player_pos[:] = (player.x, player.y, player.z)
 
-                # Interpolate for smooth movement
-                smooth_factor = 0.1
-                new_pos = camera_target + (player_pos - camera_target) * smooth_factor
+        camera_pos = self._camera_pos
+        step = (player_pos - camera_pos) * CAMERA_SMOOTHING
 
-                camera_node.setPosition(new_pos)
+        # Nothing to do once the camera has settled on a still player
+        if step @ step < CAMERA_MIN_STEP_SQ and np.array_equal(player_pos, self._look_target):
+            return
+
+        camera_pos += step
+        camera_node.setPosition(self.scratch_vector(camera_pos.tolist()))
 
-                # Look at player
-                camera_node.lookAt(player_pos, ogre.Node.TS_WORLD)
+        # Look at player
+        camera_node.lookAt(player, ogre.Node.TS_WORLD)
+        self._look_target[:] = player_pos
 
     def sync_state(self, game_state):
-        """Sync with game state updates"""
+        """Sync with game state updates, queueing only what changed"""
+        # A renderer this far behind would start losing commands to the
+        # queue bound; replace its backlog with one full snapshot instead
+        if len(self.render_queue) >= RENDER_QUEUE_CAPACITY // 2:
+            self.queue_resync(game_state)
+
+        last_sent = self._last_sent
+        culled = self._culled
+
         # Update player position
-        if game_state.player_position:
-            self.render_queue.put({
+        player_position = game_state.player_position
+        if player_position and _changed(self._last_player_pos, player_position):
+            self._last_player_pos = tuple(player_position)
+            self.render_queue.append({
                 'type': 'update_entity',
                 'entity_id': 0,  # Player ID
-                'position': game_state.player_position
+                'position': self._last_player_pos
             })
 
+        # Entities beyond the far clip plane around the player are hidden
+        # once and get no transform updates until they come back in range;
+        # the camera trails the player, so this stands in for a frustum test
+        cull_distance = self.config.get('client', {}).get('render_distance')
+        cull = bool(player_position) and cull_distance is not None
+        if cull:
+            px, py, pz = player_position[:3]
+            cull_r2 = cull_distance * cull_distance
+
         # Add/update entities
-        for entity_id, entity_data in game_state.entities.items():
-            if entity_id not in self.entities:
-                self.render_queue.put({
+        for entity_id, entity in game_state.entities.items():
+            position = _as_tuple(entity.position)
+            rotation = _as_tuple(entity.rotation)
+            sent = last_sent.get(entity_id)
+
+            if cull and sent is not None:
+                dx = position[0] - px
+                dy = position[1] - py
+                dz = position[2] - pz
+                if dx * dx + dy * dy + dz * dz > cull_r2:
+                    if entity_id not in culled:
+                        culled.add(entity_id)
+                        self.render_queue.append({
+                            'type': 'update_entity',
+                            'entity_id': entity_id,
+                            'visible': False
+                        })
+                    continue
+                if entity_id in culled:
+                    # Back in range: catch up on the transform and show it
+                    culled.discard(entity_id)
+                    last_sent[entity_id] = (position, rotation)
+                    self.render_queue.append({
+                        'type': 'update_entity',
+                        'entity_id': entity_id,
+                        'position': position,
+                        'rotation': rotation,
+                        'visible': True
+                    })
+                    continue
+
+            if sent is None:
+                last_sent[entity_id] = (position, rotation)
+                self.render_queue.append({
                     'type': 'create_entity',
                     'entity_id': entity_id,
-                    'mesh': entity_data.get('mesh', 'player.mesh'),
-                    'position': entity_data.get('position', (0, 0, 0)),
-                    'rotation': entity_data.get('rotation', (0, 0, 0, 1)),
-                    'scale': entity_data.get('scale', (1, 1, 1))
+                    'mesh': entity.mesh_name or 'player.mesh',
+                    'position': position,
+                    'rotation': rotation or (0, 0, 0, 1),
+                    'scale': (1, 1, 1)
                 })
-            else:
-                self.render_queue.put({
+                continue
+
+            moved = _changed(sent[0], position)
+            turned = _changed(sent[1], rotation)
+            if moved or turned:
+                last_sent[entity_id] = (position, rotation)
+                self.render_queue.append({
                     'type': 'update_entity',
                     'entity_id': entity_id,
-                    'position': entity_data.get('position'),
-                    'rotation': entity_data.get('rotation')
+                    'position': position if moved else None,
+                    'rotation': rotation if turned else None
                 })
 
-        # Remove entities
-        for entity_id in list(self.entities.keys()):
-            if entity_id not in game_state.entities and entity_id != 0:
-                self.render_queue.put({
-                    'type': 'remove_entity',
-                    'entity_id': entity_id
-                })
+        # Remove entities; the keys-view difference runs in C and copies
+        # only the ids that are gone
+        for entity_id in last_sent.keys() - game_state.entities.keys():
+            del last_sent[entity_id]
+            culled.discard(entity_id)
+            self.render_queue.append({
+                'type': 'remove_entity',
+                'entity_id': entity_id
+            })
 
         # Load/unload chunks
         for chunk_key in game_state.loaded_chunks:
-            chunk_x, chunk_z = map(int, chunk_key.split('_'))
             if chunk_key not in self.chunks:
-                self.render_queue.put({
+                chunk_x, chunk_z = unpack_chunk_key(chunk_key)
+                self.render_queue.append({
                     'type': 'load_chunk',
                     'chunk_x': chunk_x,
                     'chunk_z': chunk_z
                 })
 
+    def queue_resync(self, game_state):
+        """Drop queued commands in favour of a full entity snapshot"""
+        snapshot = {}
+        last_sent = {}
+        for entity_id, entity in game_state.entities.items():
+            position = _as_tuple(entity.position)
+            rotation = _as_tuple(entity.rotation) or (0, 0, 0, 1)
+            snapshot[entity_id] = (entity.mesh_name or 'player.mesh', position, rotation)
+            last_sent[entity_id] = (position, rotation)
+
+        self.render_queue.clear()
+        self.render_queue.append({'type': 'resync', 'entities': snapshot})
+        self._last_sent = last_sent
+        self._last_player_pos = None
+        # The snapshot shows every entity; the next sync hides whatever is
+        # out of range again
+        self._culled = set()
+
     def shutdown(self):
         """Clean shutdown of Ogre3D"""
         self.running = False
@@ -537,6 +890,6 @@ class Ogre3DRenderer:
                 self.root.shutdown()
 
             except Exception as e:
-                logger.error(f"Error during Ogre3D shutdown: {e}")
+                logger.error("Error during Ogre3D shutdown: %s", e)
 
         logger.info("Ogre3D renderer shut down")
@@ -0,0 +1,68 @@
+"""
+Numba-compiled terrain mesh builder and normal kernel
+"""
+
+import math
+
+import numpy as np
+from numba import njit, prange
+
+
+@njit(cache=True, fastmath=True)
+def build_terrain(heightmap, scale):
+    """Build positions, uvs and triangle indices for a square heightmap"""
+    size = heightmap.shape[0]
+    uv_step = 1.0 / max(size - 1, 1)
+
+    positions = np.empty((size * size, 3), dtype=np.float32)
+    uvs = np.empty((size * size, 2), dtype=np.float32)
+    for z in range(size):
+        for x in range(size):
+            i = z * size + x
+            positions[i, 0] = x * scale
+            positions[i, 1] = heightmap[z, x]
+            positions[i, 2] = z * scale
+            uvs[i, 0] = x * uv_step
+            uvs[i, 1] = z * uv_step
+
+    # Two triangles per grid cell
+    cells = max(size - 1, 0)
+    indices = np.empty((cells * cells * 2, 3), dtype=np.uint32)
+    t = 0
+    for z in range(cells):
+        for x in range(cells):
+            idx = z * size + x
+            indices[t, 0] = idx
+            indices[t, 1] = idx + 1
+            indices[t, 2] = idx + size
+            indices[t + 1, 0] = idx + 1
+            indices[t + 1, 1] = idx + size + 1
+            indices[t + 1, 2] = idx + size
+            t += 2
+
+    return positions, uvs, indices
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def compute_normals(heightmap, scale):
+    """Per-vertex normals from central height differences, edges replicated"""
+    size_z, size_x = heightmap.shape
+    normals = np.empty((size_z * size_x, 3), dtype=np.float32)
+    inv_span = 1.0 / (2.0 * scale)
+
+    for z in prange(size_z):
+        z0 = max(z - 1, 0)
+        z1 = min(z + 1, size_z - 1)
+        for x in range(size_x):
+            x0 = max(x - 1, 0)
+            x1 = min(x + 1, size_x - 1)
+            nx = -(heightmap[z, x1] - heightmap[z, x0]) * inv_span
+            nz = -(heightmap[z1, x] - heightmap[z0, x]) * inv_span
+            inv_len = 1.0 / math.sqrt(nx * nx + 1.0 + nz * nz)
+
+            i = z * size_x + x
+            normals[i, 0] = nx * inv_len
+            normals[i, 1] = inv_len
+            normals[i, 2] = nz * inv_len
+
+    return normals
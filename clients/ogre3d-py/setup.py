@@ -11,8 +11,8 @@ from pathlib import Path
 
 def check_python_version():
     """Check Python version"""
-    if sys.version_info < (3, 8):
-        print("Python 3.8 or higher is required")
+    if sys.version_info < (3, 10):
+        print("Python 3.10 or higher is required")
         return False
     return True
 
@@ -28,7 +28,11 @@ def install_dependencies():
         "pyyaml==6.0.1",
         "websocket-client==1.7.0",
         "msgpack==1.0.7",
+        "orjson==3.9.15",
+        "uvloop==0.19.0; sys_platform != 'win32'",
         "numpy==1.26.4",
+        "scipy==1.11.4",
+        "numba==0.59.1",
         "pillow==10.2.0",
         "pyopengl==3.1.7"
     ]
@@ -106,15 +110,11 @@ def create_sample_assets():
     from PIL import Image
     import numpy as np
 
-    # Create checkerboard texture
+    # Create checkerboard texture of 32 pixel squares
     size = 256
-    checker = np.zeros((size, size, 3), dtype=np.uint8)
-    for i in range(size):
-        for j in range(size):
-            if (i // 32 + j // 32) % 2 == 0:
-                checker[i, j] = [100, 100, 100]
-            else:
-                checker[i, j] = [150, 150, 150]
+    i, j = np.indices((size, size), dtype=np.int32)
+    odd = ((i >> 5) + (j >> 5)) & 1
+    checker = np.where(odd, 150, 100).astype(np.uint8)[..., None].repeat(3, axis=-1)
 
     texture_path = Path("assets/textures")
     texture_path.mkdir(exist_ok=True)
@@ -0,0 +1,79 @@
+"""
+Distance culling across a render queue resync
+"""
+
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from renderer import Ogre3DRenderer
+
+
+class SceneRecorder(Ogre3DRenderer):
+    """Renderer whose scene is a dict of entity visibility"""
+
+    def __init__(self, config):
+        super().__init__(None, config)
+        self.visible = {}
+
+    def create_entity(self, entity_id, mesh_name, position, rotation, scale=(1, 1, 1)):
+        self.entities[entity_id] = mesh_name
+        self.visible[entity_id] = True
+
+    def update_entity(self, entity_id, position=None, rotation=None, visible=None):
+        if entity_id in self.entities and visible is not None:
+            self.visible[entity_id] = visible
+
+    def remove_entity(self, entity_id):
+        self.entities.pop(entity_id, None)
+        self.visible.pop(entity_id, None)
+
+
+def make_entity(position):
+    return SimpleNamespace(position=position, rotation=(0, 0, 0, 1), mesh_name='npc.mesh')
+
+
+class CullResyncTest(unittest.TestCase):
+    def setUp(self):
+        self.renderer = SceneRecorder({'client': {'render_distance': 10}})
+        self.state = SimpleNamespace(
+            player_position=(0.0, 0.0, 0.0),
+            entities={1: make_entity((50.0, 0.0, 0.0)), 2: make_entity((1.0, 0.0, 0.0))},
+            loaded_chunks=()
+        )
+
+    def sync(self):
+        self.renderer.sync_state(self.state)
+        self.renderer.process_render_queue()
+
+    def test_culled_entity_reappears_after_resync(self):
+        self.sync()  # create
+        self.sync()  # cull the far entity
+        self.assertFalse(self.renderer.visible[1])
+        self.assertTrue(self.renderer.visible[2])
+
+        # Walk up to the culled entity while the queue is being resynced
+        self.state.player_position = (49.0, 0.0, 0.0)
+        self.renderer.queue_resync(self.state)
+        self.renderer.process_render_queue()
+        self.sync()
+        self.assertTrue(self.renderer.visible[1])
+        self.assertFalse(self.renderer.visible[2])
+
+    def test_resync_culls_again_out_of_range(self):
+        self.sync()
+        self.sync()
+        self.renderer.queue_resync(self.state)
+        self.renderer.process_render_queue()
+        self.sync()
+        self.assertFalse(self.renderer.visible[1])
+
+        self.state.player_position = (49.0, 0.0, 0.0)
+        self.sync()
+        self.assertTrue(self.renderer.visible[1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+# cython: language_level=3
+"""
+Compiled Vector3 for game scripts
+
+Build in place with: cythonize -i -3 _vector3.pyx
+"""
+
+from libc.math cimport sqrt
+
+
+cdef class Vector3:
+    cdef public double x
+    cdef public double y
+    cdef public double z
+
+    def __init__(self, double x=0.0, double y=0.0, double z=0.0):
+        self.x = x
+        self.y = y
+        self.z = z
+
+    cpdef double distance_to(self, Vector3 other):
+        cdef double dx = self.x - other.x
+        cdef double dy = self.y - other.y
+        cdef double dz = self.z - other.z
+        return sqrt(dx*dx + dy*dy + dz*dz)
+
+    def to_dict(self):
+        return {'x': self.x, 'y': self.y, 'z': self.z}
+
+    def __eq__(self, other):
+        if not isinstance(other, Vector3):
+            return NotImplemented
+        return (self.x == (<Vector3>other).x and
+                self.y == (<Vector3>other).y and
+                self.z == (<Vector3>other).z)
+
+    def __repr__(self):
+        return f"Vector3(x={self.x!r}, y={self.y!r}, z={self.z!r})"
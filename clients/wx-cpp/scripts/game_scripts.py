@@ -5,23 +5,39 @@ Game client Python scripting module
 
 import json
 import math
+import os
+import pickle
+from collections import Counter
 from dataclasses import dataclass
 from typing import Dict, List, Any, Optional
 
-@dataclass
-class Vector3:
-    x: float = 0.0
-    y: float = 0.0
-    z: float = 0.0
-    
-    def distance_to(self, other: 'Vector3') -> float:
-        dx = self.x - other.x
-        dy = self.y - other.y
-        dz = self.z - other.z
-        return math.sqrt(dx*dx + dy*dy + dz*dz)
-    
-    def to_dict(self) -> Dict[str, float]:
-        return {'x': self.x, 'y': self.y, 'z': self.z}
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+QUESTS_PATH = 'resources/quests.json'
+QUESTS_CACHE_PATH = 'resources/quests.pkl'
+
+try:
+    # Compiled version (see _vector3.pyx)
+    from _vector3 import Vector3
+except ImportError:
+    @dataclass(slots=True)
+    class Vector3:
+        x: float = 0.0
+        y: float = 0.0
+        z: float = 0.0
+
+        def distance_to(self, other: 'Vector3') -> float:
+            dx = self.x - other.x
+            dy = self.y - other.y
+            dz = self.z - other.z
+            return math.sqrt(dx*dx + dy*dy + dz*dz)
+
+        def to_dict(self) -> Dict[str, float]:
+            return {'x': self.x, 'y': self.y, 'z': self.z}
 
 class PlayerController:
     """Python-side player controller with custom logic"""
@@ -32,10 +48,12 @@ class PlayerController:
         self.position = Vector3()
         self.health = 100
         self.max_health = 100
-        self.inventory = {}
+        self.inventory = Counter()
         self.equipment = {}
         self.active_quests = []
         self.completed_quests = []
+        self.gold = 0
+        self.experience = 0
         
     def move_to(self, target: Vector3):
         """Move player to target position"""
@@ -82,15 +100,39 @@ class QuestSystem:
         self.load_quests()
     
     def load_quests(self):
-        """Load quest definitions from JSON"""
+        """Load quest definitions from JSON (via the pickled cache)"""
         try:
-            with open('resources/quests.json', 'r') as f:
-                quest_data = json.load(f)
-                for quest_id, quest_info in quest_data.items():
-                    self.quests[quest_id] = quest_info
-        except FileNotFoundError:
+            source_mtime = os.path.getmtime(QUESTS_PATH)
+        except OSError:
             print("Quest file not found")
-    
+            return
+
+        # Reuse the pre-parsed cache while it is newer than the JSON
+        try:
+            if os.path.getmtime(QUESTS_CACHE_PATH) >= source_mtime:
+                with open(QUESTS_CACHE_PATH, 'rb') as f:
+                    self.quests.update(pickle.load(f))
+                return
+        except (OSError, pickle.UnpicklingError, EOFError):
+            pass
+
+        # The file can still vanish between the stat above and this read
+        try:
+            with open(QUESTS_PATH, 'rb') as f:
+                raw = f.read()
+            quest_data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+        except OSError:
+            print("Quest file not found")
+            return
+        for quest_id, quest_info in quest_data.items():
+            self.quests[quest_id] = quest_info
+
+        try:
+            with open(QUESTS_CACHE_PATH, 'wb') as f:
+                pickle.dump(quest_data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError:
+            print("Could not write quest cache")
+
     def start_quest(self, player: PlayerController, quest_id: str):
         """Start a quest for a player"""
         if quest_id in self.quests and quest_id not in player.active_quests:
@@ -113,8 +155,7 @@ class QuestSystem:
     
     def give_rewards(self, player: PlayerController, rewards: Dict[str, Any]):
         """Give quest rewards to player"""
-        for item_id, quantity in rewards.get('items', {}).items():
-            player.inventory[item_id] = player.inventory.get(item_id, 0) + quantity
+        player.inventory.update(rewards.get('items', {}))
         player.gold += rewards.get('gold', 0)
         player.experience += rewards.get('experience', 0)
 
@@ -167,30 +208,49 @@ def on_chat_message(data: Dict[str, Any]):
     else:
         print(f"{sender}: {message}")
 
+def chat_teleport(args: str):
+    """Handle /teleport x y z"""
+    coords = args.split()
+    if len(coords) < 3:
+        return
+    try:
+        x, y, z = float(coords[0]), float(coords[1]), float(coords[2])
+        client.teleport_player(Vector3(x, y, z))
+    except ValueError:
+        print("Invalid coordinates")
+
+def chat_spawn(args: str):
+    """Handle /spawn entity_type"""
+    entity_type = args.strip().partition(' ')[0]
+    if not entity_type:
+        return
+    client.spawn_entity(entity_type)
+
+def chat_quest(args: str):
+    """Handle /quest info"""
+    player = client.get_player_object()
+    if player:
+        print(f"Active quests: {player.active_quests}")
+        print(f"Completed quests: {player.completed_quests}")
+
+CHAT_COMMANDS = {
+    'teleport': chat_teleport,
+    'spawn': chat_spawn,
+    'quest': chat_quest,
+}
+
 def handle_chat_command(sender: str, message: str):
     """Handle chat commands"""
-    parts = message.split()
-    command = parts[0][1:].lower()  # Remove '/'
-    
-    if command == 'teleport' and len(parts) >= 4:
-        # /teleport x y z
-        try:
-            x, y, z = float(parts[1]), float(parts[2]), float(parts[3])
-            client.teleport_player(Vector3(x, y, z))
-        except ValueError:
-            print("Invalid coordinates")
-    
-    elif command == 'spawn' and len(parts) >= 2:
-        # /spawn entity_type
-        entity_type = parts[1]
-        client.spawn_entity(entity_type)
-    
-    elif command == 'quest':
-        # /quest info
-        player = client.get_player_object()
-        if player:
-            print(f"Active quests: {player.active_quests}")
-            print(f"Completed quests: {player.completed_quests}")
+    # Slice the command token; handlers parse their own arguments
+    space = message.find(' ', 1)
+    if space >= 0:
+        command, args = message[1:space], message[space + 1:]
+    else:
+        command, args = message[1:], ''
+
+    handler = CHAT_COMMANDS.get(command.lower())
+    if handler:
+        handler(args)
 
 # Initialize systems
 quest_system = QuestSystem()
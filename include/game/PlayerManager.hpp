@@ -28,6 +28,9 @@ public:
     bool LoadFromDatabase();
 
 private:
+    // Recompute the cached critical hit stats from attributes_
+    void UpdateCritStats();
+
     int64_t id_;
     std::string username_;
 
@@ -38,6 +41,11 @@ private:
     std::unordered_map<std::string, int> inventory_;
     nlohmann::json attributes_;
 
+    // Critical chance scaled to 2^32 and damage multiplier, exported to
+    // scripts so attacks compare against raw random bits
+    int64_t crit_threshold_ = 0;
+    double crit_multiplier_ = 1.5;
+
     mutable std::shared_mutex mutex_;
 };
 
@@ -252,8 +252,15 @@ namespace PythonScripting {
 
         // Event functions
         void FireEvent(const std::string& eventName, const nlohmann::json& data);
+        void FireEvents(const std::vector<std::pair<std::string, nlohmann::json>>& events);
         void ScheduleEvent(int delayMs, const std::string& eventName, const nlohmann::json& data);
 
+        // Spatial triggers; returns the first registered zone containing the
+        // point, or an empty string
+        void RegisterSpatialTrigger(const std::string& name, float x, float y, float z, float radius);
+        void ClearSpatialTriggers();
+        std::string FindSpatialTrigger(float x, float y, float z);
+
         // Utility functions
         int64_t GetCurrentTime();
         std::string GenerateUUID();
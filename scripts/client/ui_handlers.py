@@ -1,9 +1,27 @@
 import json
 import struct
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def _loads(data: bytes):
+    """Parse JSON straight from bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _dumps(obj) -> bytes:
+    """Serialize to JSON bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
 def handle_game_state_update(data: bytes) -> bytes:
     """Process game state updates from server"""
-    state = json.loads(data.decode())
+    state = _loads(data)
 
     # Update local game state
     game_state = {
@@ -22,7 +40,7 @@ def handle_game_state_update(data: bytes) -> bytes:
 
 def process_user_input(input_data: bytes) -> bytes:
     """Process user input before sending to server"""
-    input_dict = json.loads(input_data.decode())
+    input_dict = _loads(input_data)
 
     # Apply client-side prediction
     predicted_position = predict_movement(
@@ -40,11 +58,11 @@ def process_user_input(input_data: bytes) -> bytes:
         'timestamp': input_dict['timestamp']
     }
 
-    return json.dumps(response).encode()
+    return _dumps(response)
 
 def handle_server_event(data: bytes) -> bytes:
     """Handle server events like notifications, effects"""
-    event = json.loads(data.decode())
+    event = _loads(data)
 
     if event['type'] == 'player_joined':
         show_notification(f"Player {event['player_name']} joined")
@@ -3,313 +3,336 @@
 Game event handlers written in Python
 """
 
-import json
-import time
 import random
+import functools
+import threading
+from types import MappingProxyType
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
 from gameserver import *
 
+# Special zones as (name, x, y, z, radius); the server tests them on every
+# player move and fires player_entered_zone, first match wins
+_ZONES = (
+    ("Starting Zone", 100, 100, 10, 50),
+    ("Dungeon Entrance", 500, 500, 20, 100),
+    ("Boss Arena", 1000, 1000, 30, 200)
+)
+
+# Server time in ms at the start of the current tick, set by on_tick_begin;
+# 0 until the first tick
+_tick_time = 0
+
+# Private generator for combat rolls
+_rng = random.Random()
+
+# Level-up rewards indexed by level: None or (gold, item)
+_LEVEL_REWARDS = [None] * 51
+_LEVEL_REWARDS[5] = (100, "beginner_package")
+_LEVEL_REWARDS[10] = (500, "intermediate_package")
+_LEVEL_REWARDS[20] = (1000, "advanced_package")
+_LEVEL_REWARDS[30] = (2000, "expert_package")
+_LEVEL_REWARDS[40] = (5000, "master_package")
+_LEVEL_REWARDS[50] = (10000, "legendary_package")
+_LEVEL_REWARDS = tuple(_LEVEL_REWARDS)
+
+# Features unlocked at or above a level, in ascending level order
+_UNLOCKS = (
+    (10, "unlock_mounts"),
+    (20, "unlock_pets"),
+    (30, "unlock_guilds")
+)
+
+# Events emitted by the running handler, per thread; flushed to the
+# server in one fire_events call when the handler returns
+_event_batch = threading.local()
+
+def _emit(event_name, data):
+    """Queue an event for the end of the current handler"""
+    batch = getattr(_event_batch, 'events', None)
+    if batch is None:
+        server.fire_event(event_name, data)
+    else:
+        batch.append((event_name, data))
+
+def batched_events(handler):
+    """Flush everything the handler emits with a single fire_events call"""
+    @functools.wraps(handler)
+    def wrapper(event_data):
+        # Events fired by the flush may run handlers on this thread, so
+        # each call gets its own batch
+        outer = getattr(_event_batch, 'events', None)
+        batch = _event_batch.events = []
+        try:
+            return handler(event_data)
+        finally:
+            _event_batch.events = outer
+            if batch:
+                server.fire_events(batch)
+    return wrapper
+
+@njit('Tuple((f8, b1, f8))(f8, i8, i8, i8, f8, i8)', cache=True)
+def _calc_damage(base_damage, attacker_level, target_level,
+                 crit_threshold, crit_multiplier, roll_bits):
+    """
+    Damage after the level modifier and a critical roll; the roll is 32
+    random bits, critical below crit_threshold (chance * 2**32).
+    Returns (damage, is_critical, level_modifier)
+    """
+    level_mod = 1.0 + (attacker_level - target_level) * 0.05
+    is_critical = roll_bits < crit_threshold
+    damage = base_damage * level_mod
+    if is_critical:
+        damage *= crit_multiplier
+    return damage, is_critical, level_mod
+
+def on_tick_begin(event_data):
+    """
+    Cache the server time once per tick for handlers that don't need an
+    exact timestamp
+    """
+    global _tick_time
+    _tick_time = event_data['data']['time']
+    return True
+
 def on_player_login(event_data):
     """
     Handle player login event
     """
-    try:
-        player_id = event_data['data']['player_id']
-        username = event_data['data']['username']
+    data = event_data['data']
+    player_id = data['player_id']
+    username = data['username']
 
-        server.log_info(f"Player {username} (ID: {player_id}) logged in")
+    server.log_info("Player %s (ID: %s) logged in", username, player_id)
 
-        # Send welcome message
+    # Send welcome message
+    server.send_message_to_player(
+        player_id,
+        f"Welcome back, {username}! You have been away for a while."
+    )
+
+    # Check for returning player reward
+    last_login = server.get_player(player_id).get('last_login', 0)
+    current_time = server.get_current_time()
+
+    # If player was away for more than 7 days
+    if current_time - last_login > 7 * 24 * 60 * 60 * 1000:
+        server.give_player_item(player_id, "returning_player_box", 1)
         server.send_message_to_player(
             player_id,
-            f"Welcome back, {username}! You have been away for a while."
+            "Welcome back! Here's a Returning Player Box as a thank you!"
         )
 
-        # Check for returning player reward
-        last_login = server.get_player(player_id).get('last_login', 0)
-        current_time = server.get_current_time()
-
-        # If player was away for more than 7 days
-        if current_time - last_login > 7 * 24 * 60 * 60 * 1000:
-            server.give_player_item(player_id, "returning_player_box", 1)
-            server.send_message_to_player(
-                player_id,
-                "Welcome back! Here's a Returning Player Box as a thank you!"
-            )
-
-        return True
-
-    except Exception as e:
-        server.log_error(f"Error in on_player_login: {str(e)}")
-        return False
-
-def on_player_move(event_data):
-    """
-    Handle player movement event
-    """
-    try:
-        player_id = event_data['data']['player_id']
-        x = event_data['data']['x']
-        y = event_data['data']['y']
-        z = event_data['data']['z']
-
-        # Check if player entered a special zone
-        zones = [
-            {"x": 100, "y": 100, "z": 10, "radius": 50, "name": "Starting Zone"},
-            {"x": 500, "y": 500, "z": 20, "radius": 100, "name": "Dungeon Entrance"},
-            {"x": 1000, "y": 1000, "z": 30, "radius": 200, "name": "Boss Arena"}
-        ]
-
-        for zone in zones:
-            distance = server.distance(x, y, z, zone['x'], zone['y'], zone['z'])
-            if distance <= zone['radius']:
-                server.fire_event("player_entered_zone", {
-                    "player_id": player_id,
-                    "zone_name": zone['name'],
-                    "position": {"x": x, "y": y, "z": z}
-                })
-                break
-
-        return True
-
-    except Exception as e:
-        server.log_error(f"Error in on_player_move: {str(e)}")
-        return False
+    return True
 
+@batched_events
 def on_player_attack(event_data):
     """
     Handle player attack event with custom damage calculation
     """
-    try:
-        attacker_id = event_data['data']['attacker_id']
-        target_id = event_data['data']['target_id']
-        base_damage = event_data['data']['damage']
-
-        # Get attacker stats
-        attacker = server.get_player(attacker_id)
-        target = server.get_player(target_id)
-
-        if not attacker or not target:
-            return False
-
-        # Custom damage calculation
-        attacker_level = attacker.get('level', 1)
-        target_level = target.get('level', 1)
-
-        # Level difference modifier
-        level_diff = attacker_level - target_level
-        level_mod = 1.0 + (level_diff * 0.05)
-
-        # Critical strike chance
-        crit_chance = attacker.get('attributes', {}).get('critical_chance', 0.05)
-        is_critical = random.random() < crit_chance
-
-        # Calculate final damage
-        damage = base_damage * level_mod
-
-        if is_critical:
-            crit_multiplier = attacker.get('attributes', {}).get('critical_damage', 1.5)
-            damage *= crit_multiplier
-
-            # Send critical hit message
-            server.send_message_to_player(
-                attacker_id,
-                "Critical hit! You deal bonus damage!"
-            )
-
-        # Fire damage event with calculated damage
-        server.fire_event("player_damage_calculated", {
-            "attacker_id": attacker_id,
-            "target_id": target_id,
-            "damage": damage,
-            "is_critical": is_critical,
-            "level_modifier": level_mod
-        })
+    data = event_data['data']
+    attacker_id = data['attacker_id']
+    target_id = data['target_id']
+    base_damage = data['damage']
 
-        return True
+    # Get attacker stats
+    attacker = server.get_player(attacker_id)
+    target = server.get_player(target_id)
 
-    except Exception as e:
-        server.log_error(f"Error in on_player_attack: {str(e)}")
+    if not attacker or not target:
         return False
 
+    # Custom damage calculation
+    attacker_level = int(attacker.get('level', 1))
+    target_level = int(target.get('level', 1))
+
+    damage, is_critical, level_mod = _calc_damage(
+        float(base_damage),
+        attacker_level,
+        target_level,
+        int(attacker.get('crit_u32', 214748364)),
+        float(attacker.get('crit_mult', 1.5)),
+        _rng.getrandbits(32)
+    )
+
+    if is_critical:
+        # Send critical hit message
+        server.send_message_to_player(
+            attacker_id,
+            "Critical hit! You deal bonus damage!"
+        )
+
+    # Fire damage event with calculated damage
+    _emit("player_damage_calculated", {
+        "attacker_id": attacker_id,
+        "target_id": target_id,
+        "damage": damage,
+        "is_critical": is_critical,
+        "level_modifier": level_mod
+    })
+
+    return True
+
+@batched_events
 def on_player_level_up(event_data):
     """
     Handle player level up event with rewards
     """
-    try:
-        player_id = event_data['data']['player_id']
-        new_level = event_data['data']['new_level']
+    data = event_data['data']
+    player_id = data['player_id']
+    new_level = data['new_level']
+
+    server.log_info("Player %s leveled up to level %s", player_id, new_level)
+
+    # Send congratulation message
+    server.send_message_to_player(
+        player_id,
+        f"Congratulations! You reached level {new_level}!"
+    )
+
+    # Level up rewards
+    reward = _LEVEL_REWARDS[new_level] if 0 <= new_level < len(_LEVEL_REWARDS) else None
 
-        server.log_info(f"Player {player_id} leveled up to level {new_level}")
+    if reward:
+        gold, item = reward
 
-        # Send congratulation message
+        # Give gold
+        # Note: Need to implement give_gold function in C++ API
+        server.log_info("Player %s gets %s gold for reaching level %s", player_id, gold, new_level)
+
+        # Give item
+        server.give_player_item(player_id, item, 1)
         server.send_message_to_player(
             player_id,
-            f"Congratulations! You reached level {new_level}!"
+            f"You received {item} as a level {new_level} reward!"
         )
 
-        # Level up rewards
-        rewards = {
-            5: {"gold": 100, "item": "beginner_package"},
-            10: {"gold": 500, "item": "intermediate_package"},
-            20: {"gold": 1000, "item": "advanced_package"},
-            30: {"gold": 2000, "item": "expert_package"},
-            40: {"gold": 5000, "item": "master_package"},
-            50: {"gold": 10000, "item": "legendary_package"}
-        }
-
-        if new_level in rewards:
-            reward = rewards[new_level]
+    # Unlock new features based on level
+    for min_level, unlock_event in _UNLOCKS:
+        if new_level < min_level:
+            break
+        _emit(unlock_event, {"player_id": player_id})
 
-            # Give gold
-            # Note: Need to implement give_gold function in C++ API
-            server.log_info(f"Player {player_id} gets {reward['gold']} gold for reaching level {new_level}")
+    return True
 
-            # Give item
-            server.give_player_item(player_id, reward['item'], 1)
-            server.send_message_to_player(
-                player_id,
-                f"You received {reward['item']} as a level {new_level} reward!"
-            )
+@batched_events
+def on_player_death(event_data):
+    """
+    Handle player death event with penalties and respawn logic
+    """
+    data = event_data['data']
+    player_id = data['player_id']
+    killer_id = data['killer_id']
 
-        # Unlock new features based on level
-        if new_level >= 10:
-            server.fire_event("unlock_mounts", {"player_id": player_id})
+    server.log_info("Player %s was killed by %s", player_id, killer_id)
 
-        if new_level >= 20:
-            server.fire_event("unlock_pets", {"player_id": player_id})
+    # Death penalty (experience loss)
+    player = server.get_player(player_id)
+    if player:
+        level = player.get('level', 1)
 
-        if new_level >= 30:
-            server.fire_event("unlock_guilds", {"player_id": player_id})
+        # Calculate experience loss (5% of current level's required exp)
+        exp_loss = int(level * 100 * 0.05)
 
-        return True
+        # Fire experience loss event
+        _emit("player_experience_loss", {
+            "player_id": player_id,
+            "amount": exp_loss,
+            "reason": "death"
+        })
 
-    except Exception as e:
-        server.log_error(f"Error in on_player_level_up: {str(e)}")
-        return False
+    # PvP death handling
+    if killer_id > 0 and killer_id != player_id:
+        # Award killer
+        _emit("player_pvp_kill", {
+            "killer_id": killer_id,
+            "victim_id": player_id,
+            "reward": 50  # PvP points
+        })
 
-def on_player_death(event_data):
-    """
-    Handle player death event with penalties and respawn logic
-    """
-    try:
-        player_id = event_data['data']['player_id']
-        killer_id = event_data['data']['killer_id']
-
-        server.log_info(f"Player {player_id} was killed by {killer_id}")
-
-        # Death penalty (experience loss)
-        player = server.get_player(player_id)
-        if player:
-            level = player.get('level', 1)
-
-            # Calculate experience loss (5% of current level's required exp)
-            exp_loss = int(level * 100 * 0.05)
-
-            # Fire experience loss event
-            server.fire_event("player_experience_loss", {
-                "player_id": player_id,
-                "amount": exp_loss,
-                "reason": "death"
-            })
-
-        # PvP death handling
-        if killer_id > 0 and killer_id != player_id:
-            # Award killer
-            server.fire_event("player_pvp_kill", {
-                "killer_id": killer_id,
-                "victim_id": player_id,
-                "reward": 50  # PvP points
-            })
-
-            # Send kill notification
-            server.send_message_to_player(
-                killer_id,
-                f"You defeated player {player_id} in combat!"
-            )
-
-        # Schedule respawn
-        respawn_delay = 10000  # 10 seconds
-        server.schedule_event(
-            respawn_delay,
-            "player_respawn",
-            {"player_id": player_id}
+        # Send kill notification
+        server.send_message_to_player(
+            killer_id,
+            f"You defeated player {player_id} in combat!"
         )
 
-        return True
+    # Schedule respawn
+    respawn_delay = 10000  # 10 seconds
+    server.schedule_event(
+        respawn_delay,
+        "player_respawn",
+        {"player_id": player_id}
+    )
 
-    except Exception as e:
-        server.log_error(f"Error in on_player_death: {str(e)}")
-        return False
+    return True
 
+@batched_events
 def on_player_respawn(event_data):
     """
     Handle player respawn event
     """
-    try:
-        player_id = event_data['data']['player_id']
-
-        # Get player's respawn point
-        player = server.get_player(player_id)
-        if player:
-            # Default respawn location
-            respawn_x = 100.0
-            respawn_y = 100.0
-            respawn_z = 10.0
-
-            # Check for custom respawn point (inn, checkpoint, etc.)
-            respawn_point = player.get('respawn_point', {})
-            if respawn_point:
-                respawn_x = respawn_point.get('x', respawn_x)
-                respawn_y = respawn_point.get('y', respawn_y)
-                respawn_z = respawn_point.get('z', respawn_z)
-
-            # Teleport player to respawn point
-            server.set_player_position(player_id, respawn_x, respawn_y, respawn_z)
-
-            # Restore some health and mana
-            server.fire_event("player_restore", {
-                "player_id": player_id,
-                "health_percent": 0.5,  # 50% health
-                "mana_percent": 0.5     # 50% mana
-            })
-
-            # Send respawn message
-            server.send_message_to_player(
-                player_id,
-                "You have respawned at the nearest safe location."
-            )
-
-        return True
-
-    except Exception as e:
-        server.log_error(f"Error in on_player_respawn: {str(e)}")
-        return False
+    player_id = event_data['data']['player_id']
+
+    # Get player's respawn point
+    player = server.get_player(player_id)
+    if player:
+        # Default respawn location
+        respawn_x = 100.0
+        respawn_y = 100.0
+        respawn_z = 10.0
+
+        # Check for custom respawn point (inn, checkpoint, etc.)
+        respawn_point = player.get('respawn_point', {})
+        if respawn_point:
+            respawn_x = respawn_point.get('x', respawn_x)
+            respawn_y = respawn_point.get('y', respawn_y)
+            respawn_z = respawn_point.get('z', respawn_z)
+
+        # Teleport player to respawn point
+        server.set_player_position(player_id, respawn_x, respawn_y, respawn_z)
+
+        # Restore some health and mana
+        _emit("player_restore", {
+            "player_id": player_id,
+            "health_percent": 0.5,  # 50% health
+            "mana_percent": 0.5     # 50% mana
+        })
+
+        # Send respawn message
+        server.send_message_to_player(
+            player_id,
+            "You have respawned at the nearest safe location."
+        )
+
+    return True
 
+@batched_events
 def on_custom_event(event_data):
     """
     Handle custom game events
     """
-    try:
-        event_name = event_data['event']
-        data = event_data['data']
-
-        server.log_info(f"Custom event received: {event_name}")
-
-        # Handle different custom events
-        if event_name == "quest_objective_completed":
-            handle_quest_objective(data)
-        elif event_name == "trade_completed":
-            handle_trade(data)
-        elif event_name == "guild_created":
-            handle_guild_creation(data)
-        elif event_name == "achievement_earned":
-            handle_achievement(data)
-
-        return True
-
-    except Exception as e:
-        server.log_error(f"Error in on_custom_event: {str(e)}")
-        return False
+    event_name = event_data['event']
+    data = event_data['data']
+
+    server.log_info("Custom event received: %s", event_name)
+
+    # Handle different custom events; unknown names are ignored
+    handler = _CUSTOM_DISPATCH.get(event_name)
+    if handler is not None:
+        handler(data)
+
+    return True
 
 def handle_quest_objective(data):
     """Handle quest objective completion"""
@@ -317,12 +340,12 @@ def handle_quest_objective(data):
     quest_id = data['quest_id']
     objective_id = data['objective_id']
 
-    server.log_info(f"Player {player_id} completed objective {objective_id} for quest {quest_id}")
+    server.log_info("Player %s completed objective %s for quest %s", player_id, objective_id, quest_id)
 
     # Check if all objectives are complete
     # This would query the database in a real implementation
     # For now, just fire a completion check event
-    server.fire_event("check_quest_completion", {
+    _emit("check_quest_completion", {
         "player_id": player_id,
         "quest_id": quest_id
     })
@@ -334,14 +357,14 @@ def handle_trade(data):
     items1 = data.get('items1', [])
     items2 = data.get('items2', [])
 
-    server.log_info(f"Trade completed between {player1_id} and {player2_id}")
+    server.log_info("Trade completed between %s and %s", player1_id, player2_id)
 
     # Log trade for analytics
-    server.fire_event("trade_logged", {
+    _emit("trade_logged", {
         "player1_id": player1_id,
         "player2_id": player2_id,
         "items_exchanged": len(items1) + len(items2),
-        "timestamp": server.get_current_time()
+        "timestamp": _tick_time or server.get_current_time()
     })
 
 def handle_guild_creation(data):
@@ -349,10 +372,10 @@ def handle_guild_creation(data):
     leader_id = data['leader_id']
     guild_name = data['guild_name']
 
-    server.log_info(f"Guild '{guild_name}' created by player {leader_id}")
+    server.log_info("Guild '%s' created by player %s", guild_name, leader_id)
 
     # Award guild creation achievement
-    server.fire_event("award_achievement", {
+    _emit("award_achievement", {
         "player_id": leader_id,
         "achievement_id": "guild_founder",
         "guild_name": guild_name
@@ -363,7 +386,7 @@ def handle_achievement(data):
     player_id = data['player_id']
     achievement_id = data['achievement_id']
 
-    server.log_info(f"Player {player_id} earned achievement: {achievement_id}")
+    server.log_info("Player %s earned achievement: %s", player_id, achievement_id)
 
     # Send notification to player
     server.send_message_to_player(
@@ -372,36 +395,49 @@ def handle_achievement(data):
     )
 
     # Award achievement points
-    server.fire_event("award_achievement_points", {
+    _emit("award_achievement_points", {
         "player_id": player_id,
         "points": 10,  # Default points per achievement
         "achievement_id": achievement_id
     })
 
+# Custom event handlers by event name, used by on_custom_event
+_CUSTOM_DISPATCH = MappingProxyType({
+    "quest_objective_completed": handle_quest_objective,
+    "trade_completed": handle_trade,
+    "guild_created": handle_guild_creation,
+    "achievement_earned": handle_achievement
+})
+
+# Game event handlers by event name
+EVENT_HANDLERS = MappingProxyType({
+    "player_login": on_player_login,
+    "player_attack": on_player_attack,
+    "player_level_up": on_player_level_up,
+    "player_death": on_player_death,
+    "player_respawn": on_player_respawn,
+    "custom_event": on_custom_event,
+    "tick_begin": on_tick_begin
+})
+
 # Event handler registration
 # This function is called by the C++ code to register event handlers
 def register_event_handlers():
     """
     Register all event handlers with the game server
     """
-    handlers = {
-        "player_login": on_player_login,
-        "player_move": on_player_move,
-        "player_attack": on_player_attack,
-        "player_level_up": on_player_level_up,
-        "player_death": on_player_death,
-        "player_respawn": on_player_respawn,
-        "custom_event": on_custom_event
-    }
-
     # Note: In a real implementation, we would call back to C++
     # to register these handlers. For this example, we just return
-    # the handler dictionary.
+    # the handler mapping.
 
     server.log_info("Python event handlers registered")
-    return handlers
+    return EVENT_HANDLERS
 
 # Initialize module
 if __name__ != "__main__":
-    # This code runs when the module is imported
+    # This code runs when the module is imported; a reload replaces the
+    # previous zone set, so edited or deleted zones stop firing
+    server.clear_spatial_triggers()
+    for name, x, y, z, radius in _ZONES:
+        server.register_spatial_trigger(name, x, y, z, radius)
     server.log_info("Game events module loaded")
@@ -2,11 +2,29 @@ import random
 import time
 from typing import Dict, List, Any
 
+import numpy as np
+
 class LootHandler:
+    # Loot table names by mob type, then by level tier (base, advanced, elite)
+    MOB_LOOT_TABLES = (
+        ("goblin", "goblin_advanced", "goblin_elite"),  # GOBLIN
+        ("orc", "orc_advanced", "orc_elite"),           # ORC
+        ("dragon", "dragon_advanced", "dragon_elite"),  # DRAGON
+        ("slime", "slime_advanced", "slime_elite")      # SLIME
+    )
+    DEFAULT_LOOT_TABLES = ("default", "default_advanced", "default_elite")
+    
+    # Gold multipliers by mob type
+    GOLD_MULTIPLIERS = (0.8, 1.2, 5.0, 0.5)
+    
+    __slots__ = ('server', 'loot_tables', 'item_templates', '_rng', '_np_rng')
+    
     def __init__(self, server):
         self.server = server
-        self.loot_tables = {}
+        self.loot_tables = {}  # compiled tables by name, see _compile_table
         self.item_templates = {}
+        self._rng = random.Random()
+        self._np_rng = np.random.default_rng()
         
     def register_event_handlers(self):
         """Register Python event handlers for loot system"""
@@ -17,80 +35,85 @@ class LootHandler:
         
     def on_mob_death(self, event_data: Dict[str, Any]) -> bool:
         """Handle mob death and generate loot"""
-        mob_id = event_data['data']['mobId']
-        killer_id = event_data['data']['killerId']
-        mob_type = event_data['data']['mobType']
-        mob_level = event_data['data'].get('level', 1)
+        server = self.server
+        data = event_data['data']
+        mob_id = data['mobId']
+        killer_id = data['killerId']
+        mob_type = data['mobType']
+        mob_level = data.get('level', 1)
         
         # Get player's luck stat
-        player_stats = self.server.get_player_stats(killer_id)
+        player_stats = server.get_player_stats(killer_id)
         luck_multiplier = 1.0 + (player_stats.get('luck', 0) / 100.0)
         
         # Determine loot table based on mob type
         loot_table_name = self.get_mob_loot_table(mob_type, mob_level)
         
         # Generate loot
-        loot_items = self.generate_loot(loot_table_name, mob_level, luck_multiplier)
+        loot_items = self.generate_loot(loot_table_name, mob_level, luck_multiplier, killer_id)
         
         # Add gold drop
         gold_amount = self.calculate_gold_drop(mob_type, mob_level, luck_multiplier)
         
         if gold_amount > 0:
-            self.server.add_player_gold(killer_id, gold_amount)
+            server.add_player_gold(killer_id, gold_amount)
         
         # Create loot entities in world or add directly to inventory
-        death_position = event_data['data']['deathPosition']
-        
-        for item_id, quantity in loot_items:
-            # Create loot entity in world
-            loot_entity_id = self.server.create_loot_entity(
-                death_position[0] + random.uniform(-2, 2),
-                death_position[1],
-                death_position[2] + random.uniform(-2, 2),
-                item_id,
-                quantity
-            )
-            
-            # Fire loot created event
-            self.server.fire_event('loot_created', {
+        death_position = data['deathPosition']
+        
+        # Scatter drops around the corpse and create them in one call
+        x, y, z = death_position[0], death_position[1], death_position[2]
+        offsets = self._np_rng.uniform(-2, 2, size=(len(loot_items), 2)).tolist()
+        batch = [(x + dx, y, z + dz, item_id, quantity)
+                 for (item_id, quantity), (dx, dz) in zip(loot_items, offsets)]
+        loot_entity_ids = server.create_loot_entities(batch)
+        
+        # Fire loot created events
+        server.fire_events([
+            ('loot_created', {
                 'lootEntityId': loot_entity_id,
                 'itemId': item_id,
                 'quantity': quantity,
                 'sourceMobId': mob_id,
                 'position': death_position
             })
+            for loot_entity_id, (item_id, quantity) in zip(loot_entity_ids, loot_items)
+        ])
         
         # Log loot generation
-        self.server.log_info(f"Generated {len(loot_items)} items for mob {mob_id}")
+        server.log_info("Generated %d items for mob %s", len(loot_items), mob_id)
         
         return True
     
     def on_chest_opened(self, event_data: Dict[str, Any]) -> bool:
         """Handle chest opening"""
-        chest_id = event_data['data']['chestId']
-        player_id = event_data['data']['playerId']
-        chest_type = event_data['data']['chestType']
+        server = self.server
+        data = event_data['data']
+        chest_id = data['chestId']
+        player_id = data['playerId']
+        chest_type = data['chestType']
         
         # Check if chest has been looted recently
         if self.is_chest_on_cooldown(chest_id):
-            self.server.send_message_to_player(player_id, "This chest is empty.")
+            server.send_message_to_player(player_id, "This chest is empty.")
             return False
         
         # Generate chest loot
         loot_table = f"chest_{chest_type}"
-        player_level = self.server.get_player_level(player_id)
+        player_level = server.get_player_level(player_id)
         
-        loot_items = self.generate_loot(loot_table, player_level)
+        loot_items = self.generate_loot(loot_table, player_level, player_id=player_id)
         
         # Add items directly to inventory
+        give_item = server.give_player_item
         for item_id, quantity in loot_items:
-            self.server.give_player_item(player_id, item_id, quantity)
+            give_item(player_id, item_id, quantity)
         
         # Mark chest as looted
         self.mark_chest_looted(chest_id)
         
         # Send notification
-        self.server.send_message_to_player(
+        server.send_message_to_player(
             player_id, 
             f"You found {len(loot_items)} item(s) in the chest!"
         )
@@ -98,102 +121,120 @@ class LootHandler:
         return True
     
     def generate_loot(self, table_name: str, player_level: int, 
-                     luck_multiplier: float = 1.0) -> List[tuple]:
+                     luck_multiplier: float = 1.0, player_id: int = None) -> List[tuple]:
         """Generate loot from a specific table"""
-        # Get loot table from database
-        table_data = self.server.query_database(
-            f"SELECT table_data FROM loot_tables WHERE table_id = '{table_name}'"
-        )
-        
-        if not table_data:
-            return []
-        
-        loot_table = table_data[0]['table_data']
-        results = []
+        loot_table = self._get_table(table_name)
         
         # Process guaranteed drops
-        for entry in loot_table.get('guaranteed_entries', []):
-            if self.meets_requirements(entry, player_level):
-                quantity = random.randint(
-                    entry.get('minQuantity', 1),
-                    entry.get('maxQuantity', 1)
-                )
-                results.append((entry['itemId'], quantity))
-        
-        # Process random drops
-        max_drops = loot_table.get('maxDrops', 5)
-        random_entries = loot_table.get('random_entries', [])
-        
-        for entry in random_entries:
-            if len(results) >= max_drops:
-                break
-            
-            if not self.meets_requirements(entry, player_level):
-                continue
-            
-            drop_chance = entry.get('dropChance', 0.0) * luck_multiplier
-            if random.random() <= drop_chance:
-                quantity = random.randint(
-                    entry.get('minQuantity', 1),
-                    entry.get('maxQuantity', 1)
-                )
-                results.append((entry['itemId'], quantity))
+        guaranteed = loot_table['guaranteed']
+        hits = np.flatnonzero(self._eligible(guaranteed, player_level, player_id))
+        results = self._roll_quantities(guaranteed, hits)
+        
+        # Process random drops, in table order, up to maxDrops in total
+        remaining = loot_table['max_drops'] - len(results)
+        drops = loot_table['random']
+        if remaining > 0 and len(drops['item_ids']):
+            rolls = self._np_rng.random(len(drops['item_ids']), dtype=np.float32)
+            rolled = rolls <= drops['chances'] * np.float32(luck_multiplier)
+            mask = self._eligible(drops, player_level, player_id, rolled)
+            hits = np.flatnonzero(mask)[:remaining]
+            results.extend(self._roll_quantities(drops, hits))
         
         return results
     
-    def meets_requirements(self, entry: Dict[str, Any], player_level: int) -> bool:
-        """Check if player meets loot entry requirements"""
-        if player_level < entry.get('minLevel', 1):
-            return False
-        
-        if player_level > entry.get('maxLevel', 100):
-            return False
-        
-        # Check quest requirements
-        required_quest = entry.get('requiredQuest')
-        if required_quest:
-            if not self.server.has_player_completed_quest(player_id, required_quest):
-                return False
+    def _get_table(self, table_name: str) -> Dict[str, Any]:
+        """Compiled loot table, read from the database once per name"""
+        loot_table = self.loot_tables.get(table_name)
+        if loot_table is None:
+            # query_database takes a single SQL string, so quote the literal
+            table_id = table_name.replace("'", "''")
+            table_data = self.server.query_database(
+                f"SELECT table_data FROM loot_tables WHERE table_id = '{table_id}'"
+            )
+            
+            # Unknown tables are cached as empty so they cost no further queries
+            raw = table_data[0]['table_data'] if table_data else {}
+            loot_table = self._compile_table(raw)
+            self.loot_tables[table_name] = loot_table
         
-        return True
+        return loot_table
+    
+    def invalidate_table(self, table_name: str = None):
+        """Drop a cached loot table (or all of them) so it is re-read"""
+        if table_name is None:
+            self.loot_tables.clear()
+        else:
+            self.loot_tables.pop(table_name, None)
+    
+    def _compile_table(self, loot_table: Dict[str, Any]) -> Dict[str, Any]:
+        """Lay a raw loot table out as per-column arrays for vectorized rolls"""
+        def columns(entries):
+            return {
+                'item_ids': np.array([e['itemId'] for e in entries], dtype=object),
+                'chances': np.array([e.get('dropChance', 0.0) for e in entries], dtype=np.float32),
+                'min_q': np.array([e.get('minQuantity', 1) for e in entries], dtype=np.int32),
+                'max_q': np.array([e.get('maxQuantity', 1) for e in entries], dtype=np.int32),
+                'min_lvl': np.array([e.get('minLevel', 1) for e in entries], dtype=np.int32),
+                'max_lvl': np.array([e.get('maxLevel', 100) for e in entries], dtype=np.int32),
+                'quests': np.array([e.get('requiredQuest') or None for e in entries], dtype=object),
+                'needs_quest': np.array([bool(e.get('requiredQuest')) for e in entries], dtype=bool),
+            }
+        
+        return {
+            'guaranteed': columns(loot_table.get('guaranteed_entries', [])),
+            'random': columns(loot_table.get('random_entries', [])),
+            'max_drops': loot_table.get('maxDrops', 5),
+        }
+    
+    def _eligible(self, columns: Dict[str, Any], player_level: int,
+                  player_id: int = None, mask: np.ndarray = None) -> np.ndarray:
+        """Mask of entries (narrowing mask, if given) whose requirements the player meets"""
+        in_range = (columns['min_lvl'] <= player_level) & (player_level <= columns['max_lvl'])
+        mask = in_range if mask is None else mask & in_range
+        
+        # Quest requirements are only checked for entries still in play,
+        # all in one server call; without a player they can't be met
+        gated = np.flatnonzero(mask & columns['needs_quest'])
+        if len(gated):
+            quests = columns['quests'][gated].tolist()
+            completed = set()
+            if player_id is not None:
+                completed = set(self.server.has_player_completed_quests(player_id, list(set(quests))))
+            mask[gated] = [quest in completed for quest in quests]
+        return mask
+    
+    def _roll_quantities(self, columns: Dict[str, Any], hits: np.ndarray) -> List[tuple]:
+        """Pair the chosen entries' item ids with rolled quantities"""
+        if not len(hits):
+            return []
+        quantities = self._np_rng.integers(
+            columns['min_q'][hits], columns['max_q'][hits], endpoint=True
+        )
+        return list(zip(columns['item_ids'][hits].tolist(), quantities.tolist()))
     
     def get_mob_loot_table(self, mob_type: int, mob_level: int) -> str:
         """Get appropriate loot table for mob type and level"""
-        mob_types = {
-            0: "goblin",  # GOBLIN
-            1: "orc",     # ORC
-            2: "dragon",  # DRAGON
-            3: "slime"    # SLIME
-        }
-        
-        base_table = mob_types.get(mob_type, "default")
-        
-        # Adjust table based on level
-        if mob_level >= 20:
-            return f"{base_table}_elite"
-        elif mob_level >= 10:
-            return f"{base_table}_advanced"
+        if 0 <= mob_type < len(self.MOB_LOOT_TABLES):
+            tables = self.MOB_LOOT_TABLES[mob_type]
         else:
-            return base_table
+            tables = self.DEFAULT_LOOT_TABLES
+        
+        # Level tier: 0 below 10, 1 from 10, 2 from 20
+        return tables[(mob_level >= 10) + (mob_level >= 20)]
     
     def calculate_gold_drop(self, mob_type: int, mob_level: int, 
                            luck_multiplier: float) -> int:
         """Calculate gold drop from mob"""
         base_gold = mob_level * 10
         
-        # Type multipliers
-        type_multipliers = {
-            0: 0.8,   # GOBLIN
-            1: 1.2,   # ORC
-            2: 5.0,   # DRAGON
-            3: 0.5    # SLIME
-        }
-        
-        multiplier = type_multipliers.get(mob_type, 1.0)
+        if 0 <= mob_type < len(self.GOLD_MULTIPLIERS):
+            multiplier = self.GOLD_MULTIPLIERS[mob_type]
+        else:
+            multiplier = 1.0
         gold = int(base_gold * multiplier * luck_multiplier)
         
         # Add random variation
-        variation = random.randint(-gold // 4, gold // 4)
+        variation = self._rng.randrange(-gold // 4, gold // 4 + 1)
         gold += variation
         
         return max(1, gold)
@@ -5,6 +5,11 @@ Quest system implemented in Python
 
 import json
 import random
+import sys
+from dataclasses import asdict, dataclass, field
+from types import MappingProxyType
+from typing import Dict, Optional
+
 from gameserver import *
 
 # Quest database (in production, this would be in a real database)
@@ -41,9 +46,60 @@ quests_db = {
     }
 }
 
-# Player quest progress tracker
+@dataclass(slots=True)
+class ObjectiveProgress:
+    """Progress towards one quest objective"""
+    current: int
+    required: int
+    completed: bool = False
+
+@dataclass(slots=True)
+class QuestProgress:
+    """A player's progress on an accepted quest"""
+    accepted: int
+    remaining: int
+    objectives: Dict[int, ObjectiveProgress] = field(default_factory=dict)
+    completed: bool = False
+    completed_at: Optional[int] = None
+
+# Player quest progress tracker, keyed by (player_id, quest_id)
 player_quests = {}
 
+# Quest ids each player has accepted, in acceptance order
+player_quest_ids = {}
+
+# Active objectives per player: (type, target) ->
+# [(quest_id, objective_id, QuestProgress, ObjectiveProgress)]
+player_objective_index = {}
+
+def objective_key(objective):
+    """
+    Index key of an objective, with string parts interned; collect
+    objectives name their target 'item', which may also be an int id
+    """
+    target = objective.get('target', objective.get('item'))
+    if type(target) is str:
+        target = sys.intern(target)
+    return (sys.intern(objective['type']), target)
+
+def build_quest_objectives():
+    """Per-quest tuples of (objective_id, index key, required count)"""
+    return {
+        quest_id: tuple(
+            (objective['id'], objective_key(objective), objective['count'])
+            for objective in quest['objectives']
+        )
+        for quest_id, quest in quests_db.items()
+    }
+
+# Objectives of every quest, laid out once; rebuild when quests_db changes
+quest_objectives = build_quest_objectives()
+
+def _flush_events(events):
+    """Fire queued (name, data) events with one server call"""
+    if events:
+        server.fire_events(events)
+
 def get_quest(quest_id):
     """Get quest data by ID"""
     return quests_db.get(quest_id)
@@ -54,19 +110,17 @@ def can_accept_quest(player_id, quest_id):
     if not quest:
         return False
 
-    player = server.get_player(player_id)
-    if not player:
-        return False
-
-    # Check level requirement
-    if player.get('level', 1) < quest['level_requirement']:
+    # Check if already has quest
+    if (player_id, quest_id) in player_quests:
         return False
 
-    # Check if already has quest
-    if player_id in player_quests and quest_id in player_quests[player_id]:
+    # Check level requirement; the player lookup goes through the server,
+    # so it comes after the local checks
+    player = server.get_player(player_id)
+    if not player:
         return False
 
-    return True
+    return player.get('level', 1) >= quest['level_requirement']
 
 def accept_quest(player_id, quest_id):
     """Player accepts a quest"""
@@ -76,24 +130,21 @@ def accept_quest(player_id, quest_id):
     quest = get_quest(quest_id)
 
     # Initialize quest progress
-    if player_id not in player_quests:
-        player_quests[player_id] = {}
-
-    player_quests[player_id][quest_id] = {
-        "accepted": server.get_current_time(),
-        "objectives": {},
-        "completed": False
-    }
-
-    # Initialize objective progress
-    for objective in quest['objectives']:
-        player_quests[player_id][quest_id]['objectives'][objective['id']] = {
-            "current": 0,
-            "required": objective['count'],
-            "completed": False
-        }
-
-    server.log_info(f"Player {player_id} accepted quest: {quest['name']}")
+    quest_data = QuestProgress(
+        accepted=server.get_current_time(),
+        remaining=len(quest_objectives[quest_id])
+    )
+    player_quest_ids.setdefault(player_id, []).append(quest_id)
+    player_quests[player_id, quest_id] = quest_data
+
+    # Initialize objective progress and index it for update_quest_progress
+    objective_index = player_objective_index.setdefault(player_id, {})
+    for obj_id, key, required in quest_objectives[quest_id]:
+        objective = ObjectiveProgress(current=0, required=required)
+        quest_data.objectives[obj_id] = objective
+        objective_index.setdefault(key, []).append((quest_id, obj_id, quest_data, objective))
+
+    server.log_info("Player %s accepted quest: %s", player_id, quest['name'])
 
     # Fire quest accepted event
     server.fire_event("quest_accepted", {
@@ -108,65 +159,55 @@ def update_quest_progress(player_id, objective_type, target, amount=1):
     """
     Update quest progress based on player actions
     """
-    if player_id not in player_quests:
+    entries = player_objective_index.get(player_id, {}).get((objective_type, target))
+    if not entries:
         return
 
-    for quest_id, quest_data in player_quests[player_id].items():
-        if quest_data['completed']:
-            continue
+    # Events raised along the way, fired together at the end
+    events = []
 
-        quest = get_quest(quest_id)
-        if not quest:
+    # complete_quest removes entries from the index, so walk a copy
+    for quest_id, obj_id, quest_data, objective in list(entries):
+        if objective.completed:
             continue
 
-        for objective in quest['objectives']:
-            if objective['type'] == objective_type and objective['target'] == target:
-                obj_id = objective['id']
+        # Update progress
+        required = objective.required
+        new_progress = min(objective.current + amount, required)
+        objective.current = new_progress
 
-                if obj_id in quest_data['objectives']:
-                    current = quest_data['objectives'][obj_id]['current']
-                    required = quest_data['objectives'][obj_id]['required']
+        # Check if objective completed
+        if new_progress >= required:
+            objective.completed = True
+            quest_data.remaining -= 1
 
-                    # Update progress
-                    new_progress = min(current + amount, required)
-                    quest_data['objectives'][obj_id]['current'] = new_progress
+            events.append(("quest_objective_completed", {
+                "player_id": player_id,
+                "quest_id": quest_id,
+                "objective_id": obj_id
+            }))
 
-                    # Check if objective completed
-                    if new_progress >= required:
-                        quest_data['objectives'][obj_id]['completed'] = True
+            # Check if all objectives are complete
+            if quest_data.remaining == 0:
+                complete_quest(player_id, quest_id, events)
 
-                        server.fire_event("quest_objective_completed", {
-                            "player_id": player_id,
-                            "quest_id": quest_id,
-                            "objective_id": obj_id
-                        })
-
-                    # Check if all objectives are complete
-                    if check_quest_completion(player_id, quest_id):
-                        complete_quest(player_id, quest_id)
+    _flush_events(events)
 
 def check_quest_completion(player_id, quest_id):
     """Check if all quest objectives are complete"""
-    if (player_id not in player_quests or
-        quest_id not in player_quests[player_id]):
+    quest_data = player_quests.get((player_id, quest_id))
+    if quest_data is None:
         return False
 
-    quest_data = player_quests[player_id][quest_id]
-
-    for obj_id, obj_data in quest_data['objectives'].items():
-        if not obj_data['completed']:
-            return False
-
-    return True
-
-def complete_quest(player_id, quest_id):
-    """Complete a quest and give rewards"""
-    if (player_id not in player_quests or
-        quest_id not in player_quests[player_id]):
-        return
+    return quest_data.remaining == 0
 
-    quest_data = player_quests[player_id][quest_id]
-    if quest_data['completed']:
+def complete_quest(player_id, quest_id, events=None):
+    """
+    Complete a quest and give rewards; events are queued on the given
+    list, or fired before returning when none is passed
+    """
+    quest_data = player_quests.get((player_id, quest_id))
+    if quest_data is None or quest_data.completed:
         return
 
     quest = get_quest(quest_id)
@@ -174,35 +215,48 @@ def complete_quest(player_id, quest_id):
         return
 
     # Mark quest as completed
-    quest_data['completed'] = True
-    quest_data['completed_at'] = server.get_current_time()
+    quest_data.completed = True
+    quest_data.completed_at = server.get_current_time()
+
+    # Its objectives no longer take progress
+    objective_index = player_objective_index.get(player_id, {})
+    for _, key, _ in quest_objectives[quest_id]:
+        entries = [entry for entry in objective_index.get(key, ()) if entry[0] != quest_id]
+        if entries:
+            objective_index[key] = entries
+        else:
+            objective_index.pop(key, None)
 
     # Give rewards
     rewards = quest['rewards']
 
+    queued = [] if events is None else events
+
     # Experience
-    server.fire_event("player_experience_gain", {
+    queued.append(("player_experience_gain", {
         "player_id": player_id,
         "amount": rewards['experience'],
         "source": f"quest_{quest_id}"
-    })
+    }))
 
     # Gold (would need give_gold function)
-    server.log_info(f"Player {player_id} gets {rewards['gold']} gold from quest {quest_id}")
+    server.log_info("Player %s gets %s gold from quest %s", player_id, rewards['gold'], quest_id)
 
     # Items
     for item_id in rewards['items']:
         server.give_player_item(player_id, item_id, 1)
 
-    server.log_info(f"Player {player_id} completed quest: {quest['name']}")
+    server.log_info("Player %s completed quest: %s", player_id, quest['name'])
 
     # Fire quest completed event
-    server.fire_event("quest_completed", {
+    queued.append(("quest_completed", {
         "player_id": player_id,
         "quest_id": quest_id,
         "quest_name": quest['name'],
         "rewards": rewards
-    })
+    }))
+    if events is None:
+        _flush_events(queued)
 
     # Check for follow-up quests
     check_followup_quests(player_id, quest_id)
@@ -214,35 +268,32 @@ def check_followup_quests(player_id, completed_quest_id):
 
 def get_player_quests(player_id):
     """Get all quests for a player"""
-    if player_id not in player_quests:
-        return []
-
     result = []
-    for quest_id, quest_data in player_quests[player_id].items():
+    for quest_id in player_quest_ids.get(player_id, ()):
         quest = get_quest(quest_id)
         if quest:
             result.append({
                 "quest": quest,
-                "progress": quest_data
+                "progress": asdict(player_quests[player_id, quest_id])
             })
 
     return result
 
-def on_player_kill(event_data):
-    """Handle player kill event for quest tracking"""
-    player_id = event_data['data'].get('player_id')
-    target_type = event_data['data'].get('target_type')
-
-    if player_id and target_type:
-        update_quest_progress(player_id, "kill", target_type)
-
-def on_item_collected(event_data):
-    """Handle item collection event for quest tracking"""
-    player_id = event_data['data'].get('player_id')
-    item_id = event_data['data'].get('item_id')
-
-    if player_id and item_id:
-        update_quest_progress(player_id, "collect", item_id)
+# Quest-tracked game events: event name -> (objective type, target field)
+QUEST_EVENTS = MappingProxyType({
+    "player_kill": ("kill", "target_type"),
+    "item_collected": ("collect", "item_id")
+})
+
+def on_quest_event(event_data):
+    """Handle any event in QUEST_EVENTS for quest tracking"""
+    objective_type, target_field = QUEST_EVENTS[event_data['event']]
+    data = event_data['data']
+    player_id = data.get('player_id')
+    target = data.get(target_field)
+
+    if player_id and target:
+        update_quest_progress(player_id, objective_type, target)
 
 # Initialize module
 if __name__ != "__main__":
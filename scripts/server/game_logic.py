@@ -1,5 +1,12 @@
 # scripts/game_logic.py
 import json
+import random
+
+import numpy as np
+
+# Generators for critical hit rolls, scalar and batched
+_rng = random.Random()
+_np_rng = np.random.default_rng()
 
 def handle_player_move(player_data, move_data):
     """Process player movement with game logic"""
@@ -29,5 +36,22 @@ def calculate_damage(attacker, defender, weapon):
 
     return {
         "damage": damage,
-        "critical": random.random() < attacker.get("crit_chance", 0.1)
+        "critical": _rng.random() < attacker.get("crit_chance", 0.1)
+    }
+
+def calculate_damage_batch(attackers, defenders, weapons):
+    """
+    calculate_damage for many attacks at once, given parallel lists;
+    returns {"damage": [...], "critical": [...]} in the same order
+    """
+    base_damage = np.array([w["damage"] for w in weapons], dtype=np.float64)
+    defense = np.array([d.get("armor", 0) for d in defenders], dtype=np.float64)
+    crit_chance = np.array([a.get("crit_chance", 0.1) for a in attackers], dtype=np.float64)
+
+    damage = base_damage * (1 - defense / (defense + 100))
+    critical = _np_rng.random(len(crit_chance)) < crit_chance
+
+    return {
+        "damage": damage.tolist(),
+        "critical": critical.tolist()
     }
@@ -714,6 +714,16 @@ void GameLogic::HandlePlayerPositionUpdate(uint64_t sessionId, const nlohmann::j
                     {"session_id", sessionId}
                 };
                 FirePythonEvent("player_move_3d", eventData);
+
+                // Zone checks stay native; scripts only hear about hits
+                std::string zone = PythonScripting::PythonAPI::FindSpatialTrigger(x, y, z);
+                if (!zone.empty()) {
+                    FirePythonEvent("player_entered_zone", {
+                        {"player_id", playerId},
+                        {"zone_name", zone},
+                        {"position", {{"x", x}, {"y", y}, {"z", z}}}
+                    });
+                }
             }
         }
 
@@ -984,6 +994,12 @@ void GameLogic::GameLoop() {
             float deltaTime = deltaTimeMillis.count() / 1000.0f;
             lastUpdate = now;
 
+            // Let scripts cache the wall-clock time once per tick
+            FirePythonEvent("tick_begin", {
+                {"time", std::chrono::duration_cast<std::chrono::milliseconds>(
+                    std::chrono::system_clock::now().time_since_epoch()).count()}
+            });
+
             // Update 3D world systems
             UpdateWorld(deltaTime);
             UpdateNPCs(deltaTime);
@@ -1138,12 +1154,12 @@ void GameLogic::RegisterPythonEventHandlers() {
 
     // Register existing event handlers
     pythonScripting_.RegisterEventHandler("player_login", "game_events", "on_player_login");
-    pythonScripting_.RegisterEventHandler("player_move", "game_events", "on_player_move");
     pythonScripting_.RegisterEventHandler("player_attack", "game_events", "on_player_attack");
     pythonScripting_.RegisterEventHandler("player_level_up", "game_events", "on_player_level_up");
     pythonScripting_.RegisterEventHandler("player_death", "game_events", "on_player_death");
     pythonScripting_.RegisterEventHandler("player_respawn", "game_events", "on_player_respawn");
     pythonScripting_.RegisterEventHandler("custom_event", "game_events", "on_custom_event");
+    pythonScripting_.RegisterEventHandler("tick_begin", "game_events", "on_tick_begin");
 
     // Register 3D world event handlers
     pythonScripting_.RegisterEventHandler("player_move_3d", "world_events", "on_player_move_3d");
@@ -1153,8 +1169,8 @@ void GameLogic::RegisterPythonEventHandlers() {
     pythonScripting_.RegisterEventHandler("collision_detected", "world_events", "on_collision_detected");
 
     // Register quest system handlers
-    pythonScripting_.RegisterEventHandler("player_kill", "quests", "on_player_kill");
-    pythonScripting_.RegisterEventHandler("item_collected", "quests", "on_item_collected");
+    pythonScripting_.RegisterEventHandler("player_kill", "quests", "on_quest_event");
+    pythonScripting_.RegisterEventHandler("item_collected", "quests", "on_quest_event");
 
     Logger::Info("Python event handlers registered for 3D world system");
 }
@@ -56,6 +56,7 @@ connection_quality_(100.0f) {
         {"health_regen", 0.1},
         {"mana_regen", 0.2}
     };
+    UpdateCritStats();
 
     // Initialize default settings
     settings_ = {
@@ -169,6 +170,7 @@ int Player::GetItemCount(const std::string& itemId) const {
 void Player::SetAttribute(const std::string& key, const nlohmann::json& value) {
     std::unique_lock<std::shared_mutex> lock(mutex_);
     attributes_[key] = value;
+    UpdateCritStats();
 }
 
 nlohmann::json Player::GetAttribute(const std::string& key, const nlohmann::json& defaultValue) const {
@@ -181,6 +183,13 @@ nlohmann::json Player::GetAttributes() const {
     return attributes_;
 }
 
+void Player::UpdateCritStats() {
+    // Called with mutex_ held exclusively, after any attribute change
+    crit_threshold_ = static_cast<int64_t>(
+        attributes_.value("critical_chance", 0.05) * 4294967296.0);
+    crit_multiplier_ = attributes_.value("critical_damage", 1.5);
+}
+
 void Player::SetHealth(int health) {
     std::unique_lock<std::shared_mutex> lock(mutex_);
     health_ = std::clamp(health, 0, max_health_);
@@ -381,6 +390,8 @@ void Player::ApplyBuff(const std::string& buffId, const nlohmann::json& buffData
         }
     }
 
+    UpdateCritStats();
+
     active_buffs_.push_back(buff);
 }
 
@@ -396,6 +407,7 @@ void Player::RemoveBuff(const std::string& buffId) {
                     attributes_[key] = current - value.get<float>();
                 }
             }
+            UpdateCritStats();
             active_buffs_.erase(it);
             return;
         }
@@ -406,6 +418,7 @@ void Player::UpdateBuffs(float deltaTime) {
     std::unique_lock<std::shared_mutex> lock(mutex_);
 
     auto now = std::chrono::steady_clock::now();
+    bool expired = false;
     for (auto it = active_buffs_.begin(); it != active_buffs_.end();) {
         if (now >= it->expires_at) {
             // Remove expired buff effects
@@ -416,10 +429,14 @@ void Player::UpdateBuffs(float deltaTime) {
                 }
             }
             it = active_buffs_.erase(it);
+            expired = true;
         } else {
             ++it;
         }
     }
+    if (expired) {
+        UpdateCritStats();
+    }
 }
 
 nlohmann::json Player::ToJson() const {
@@ -443,6 +460,8 @@ nlohmann::json Player::ToJson() const {
         {"z", position_.z}
     };
     json["attributes"] = attributes_;
+    json["crit_u32"] = crit_threshold_;
+    json["crit_mult"] = crit_multiplier_;
     json["inventory"] = inventory_;
     json["equipment"] = equipment_;
     json["achievements"] = achievements_;
@@ -528,6 +547,7 @@ bool Player::LoadFromDatabase() {
         // Load JSON data
         if (playerData.contains("attributes") && playerData["attributes"].is_object()) {
             attributes_ = playerData["attributes"];
+            UpdateCritStats();
         }
 
         if (playerData.contains("inventory") && playerData["inventory"].is_array()) {
@@ -8,6 +8,16 @@
 
 namespace PythonScripting {
 
+// Zones registered by scripts, tested natively on every player move
+struct SpatialTrigger {
+    std::string name;
+    float x, y, z;
+    float radiusSq;
+};
+
+static std::vector<SpatialTrigger> spatialTriggers;
+static std::shared_mutex spatialTriggersMutex;
+
 // =============== Python C API Functions ===============
 
 // Helper to convert nlohmann::json to Python object
@@ -44,8 +54,19 @@ PyObject* JsonToPython(const nlohmann::json& json) {
     if (json.is_object()) {
         PyObject* dict = PyDict_New();
         for (const auto& [key, value] : json.items()) {
+            // Player attributes, config entries and query rows repeat the
+            // same field names, so interned keys are shared between dicts
+            // and match the scripts' string literals by identity
+            PyObject* pyKey = PyUnicode_InternFromString(key.c_str());
             PyObject* pyValue = JsonToPython(value);
-            PyDict_SetItemString(dict, key.c_str(), pyValue);
+            if (!pyKey || !pyValue) {
+                Py_XDECREF(pyKey);
+                Py_XDECREF(pyValue);
+                Py_DECREF(dict);
+                return nullptr;
+            }
+            PyDict_SetItem(dict, pyKey, pyValue);
+            Py_DECREF(pyKey);
             Py_DECREF(pyValue);
         }
         return dict;
@@ -117,59 +138,126 @@ nlohmann::json PythonToJson(PyObject* obj) {
 }
 
 // Python function wrappers
-static PyObject* py_log_debug(PyObject* self, PyObject* args) {
-    const char* message;
 
-    if (!PyArg_ParseTuple(args, "s", &message)) {
-        return nullptr;
+// Traceback of the exception being handled (sys.exc_info()), or empty
+static std::string FormatHandledException() {
+    PyObject* type;
+    PyObject* value;
+    PyObject* traceback;
+    PyErr_GetExcInfo(&type, &value, &traceback);
+
+    std::string result;
+    if (type && type != Py_None) {
+        PyObjectRef tracebackModule(PyImport_ImportModule("traceback"));
+        if (tracebackModule) {
+            PyObjectRef lines(PyObject_CallMethod(tracebackModule.get(), "format_exception", "OOO",
+                                                  type, value ? value : Py_None,
+                                                  traceback ? traceback : Py_None));
+            PyObjectRef empty(PyUnicode_FromString(""));
+            if (lines && empty) {
+                PyObjectRef joined(PyUnicode_Join(empty.get(), lines.get()));
+                const char* text = joined ? PyUnicode_AsUTF8(joined.get()) : nullptr;
+                if (text) {
+                    result = text;
+                }
+            }
+        }
+        // A failed format just drops the traceback from the message
+        PyErr_Clear();
     }
 
-    Logger::Debug("[Python] {}", message);
-    Py_RETURN_NONE;
+    Py_XDECREF(type);
+    Py_XDECREF(value);
+    Py_XDECREF(traceback);
+    return result;
 }
 
-static PyObject* py_log_info(PyObject* self, PyObject* args) {
-    const char* message;
-
-    if (!PyArg_ParseTuple(args, "s", &message)) {
+// Log (template, *args) at the given level, %-formatting only when the level
+// is enabled so filtered-out messages cost no string building; with
+// excInfo the handled exception's traceback is appended the same way
+static PyObject* LogFormatted(PyObject* args, spdlog::level::level_enum level, bool excInfo = false) {
+    Py_ssize_t nargs = PyTuple_GET_SIZE(args);
+    if (nargs < 1) {
+        PyErr_SetString(PyExc_TypeError, "log message required");
         return nullptr;
     }
 
-    Logger::Info("[Python] {}", message);
-    Py_RETURN_NONE;
-}
+    auto logger = Logger::GetLogger();
+    if (!logger->should_log(level)) {
+        Py_RETURN_NONE;
+    }
 
-static PyObject* py_log_warning(PyObject* self, PyObject* args) {
-    const char* message;
+    PyObject* text;
+    if (nargs == 1) {
+        text = PyObject_Str(PyTuple_GET_ITEM(args, 0));
+    } else {
+        PyObject* values = PyTuple_GetSlice(args, 1, nargs);
+        if (!values) {
+            return nullptr;
+        }
+        text = PyUnicode_Format(PyTuple_GET_ITEM(args, 0), values);
+        Py_DECREF(values);
+    }
+    if (!text) {
+        return nullptr;
+    }
 
-    if (!PyArg_ParseTuple(args, "s", &message)) {
+    const char* message = PyUnicode_AsUTF8(text);
+    if (!message) {
+        Py_DECREF(text);
         return nullptr;
     }
 
-    Logger::Warn("[Python] {}", message);
+    if (excInfo) {
+        std::string traceback = FormatHandledException();
+        if (!traceback.empty()) {
+            logger->log(level, "[Python] {}\n{}", message, traceback);
+            Py_DECREF(text);
+            Py_RETURN_NONE;
+        }
+    }
+
+    logger->log(level, "[Python] {}", message);
+    Py_DECREF(text);
     Py_RETURN_NONE;
 }
 
-static PyObject* py_log_error(PyObject* self, PyObject* args) {
-    const char* message;
+static PyObject* py_log_debug(PyObject* self, PyObject* args) {
+    return LogFormatted(args, spdlog::level::debug);
+}
 
-    if (!PyArg_ParseTuple(args, "s", &message)) {
-        return nullptr;
+static PyObject* py_log_info(PyObject* self, PyObject* args) {
+    return LogFormatted(args, spdlog::level::info);
+}
+
+static PyObject* py_log_warning(PyObject* self, PyObject* args) {
+    return LogFormatted(args, spdlog::level::warn);
+}
+
+static PyObject* py_log_error(PyObject* self, PyObject* args, PyObject* kwargs) {
+    static const char* kwlist[] = {"exc_info", nullptr};
+    int excInfo = 0;
+
+    if (kwargs) {
+        PyObjectRef noArgs(PyTuple_New(0));
+        if (!noArgs || !PyArg_ParseTupleAndKeywords(noArgs.get(), kwargs, "|$p",
+                                                    const_cast<char**>(kwlist), &excInfo)) {
+            return nullptr;
+        }
     }
 
-    Logger::Error("[Python] {}", message);
-    Py_RETURN_NONE;
+    return LogFormatted(args, spdlog::level::err, excInfo != 0);
 }
 
 static PyObject* py_log_critical(PyObject* self, PyObject* args) {
-    const char* message;
+    return LogFormatted(args, spdlog::level::critical);
+}
 
-    if (!PyArg_ParseTuple(args, "s", &message)) {
-        return nullptr;
+static PyObject* py_is_debug_enabled(PyObject* self, PyObject* args) {
+    if (Logger::GetLogger()->should_log(spdlog::level::debug)) {
+        Py_RETURN_TRUE;
     }
-
-    Logger::Critical("[Python] {}", message);
-    Py_RETURN_NONE;
+    Py_RETURN_FALSE;
 }
 
 static PyObject* py_get_player(PyObject* self, PyObject* args) {
@@ -337,6 +425,62 @@ static PyObject* py_fire_event(PyObject* self, PyObject* args) {
     Py_RETURN_NONE;
 }
 
+static PyObject* py_fire_events(PyObject* self, PyObject* args) {
+    PyObject* events_obj;
+
+    if (!PyArg_ParseTuple(args, "O", &events_obj)) {
+        return nullptr;
+    }
+
+    PyObject* seq = PySequence_Fast(events_obj, "fire_events expects a sequence of (name, data) pairs");
+    if (!seq) {
+        return nullptr;
+    }
+
+    // Convert the whole batch first so handlers fired below can't see
+    // (or mutate) a half-read sequence
+    std::vector<std::pair<std::string, nlohmann::json>> events;
+    Py_ssize_t count = PySequence_Fast_GET_SIZE(seq);
+    PyObject** items = PySequence_Fast_ITEMS(seq);
+    events.reserve(count);
+
+    for (Py_ssize_t i = 0; i < count; ++i) {
+        const char* event_name;
+        PyObject* data_obj;
+
+        if (!PyArg_ParseTuple(items[i], "sO", &event_name, &data_obj)) {
+            Py_DECREF(seq);
+            return nullptr;
+        }
+        events.emplace_back(event_name, PythonToJson(data_obj));
+    }
+    Py_DECREF(seq);
+
+    auto& scripting = PythonScripting::GetInstance();
+    for (const auto& [event_name, data] : events) {
+        scripting.FireEvent(event_name, data);
+    }
+
+    Py_RETURN_NONE;
+}
+
+static PyObject* py_register_spatial_trigger(PyObject* self, PyObject* args) {
+    const char* name;
+    double x, y, z, radius;
+
+    if (!PyArg_ParseTuple(args, "sdddd", &name, &x, &y, &z, &radius)) {
+        return nullptr;
+    }
+
+    PythonAPI::RegisterSpatialTrigger(name, x, y, z, radius);
+    Py_RETURN_NONE;
+}
+
+static PyObject* py_clear_spatial_triggers(PyObject* self, PyObject* args) {
+    PythonAPI::ClearSpatialTriggers();
+    Py_RETURN_NONE;
+}
+
 static PyObject* py_schedule_event(PyObject* self, PyObject* args) {
     int delay_ms;
     const char* event_name;
@@ -459,11 +603,13 @@ static PyObject* py_get_config(PyObject* self, PyObject* args) {
 // Method definitions
 static PyMethodDef GameServerMethods[] = {
     // Logging
-    {"log_debug", py_log_debug, METH_VARARGS, "Log debug message"},
-    {"log_info", py_log_info, METH_VARARGS, "Log info message"},
-    {"log_warning", py_log_warning, METH_VARARGS, "Log warning message"},
-    {"log_error", py_log_error, METH_VARARGS, "Log error message"},
-    {"log_critical", py_log_critical, METH_VARARGS, "Log critical message"},
+    {"log_debug", py_log_debug, METH_VARARGS, "Log debug message, %-formatting any extra args"},
+    {"log_info", py_log_info, METH_VARARGS, "Log info message, %-formatting any extra args"},
+    {"log_warning", py_log_warning, METH_VARARGS, "Log warning message, %-formatting any extra args"},
+    {"log_error", reinterpret_cast<PyCFunction>(py_log_error), METH_VARARGS | METH_KEYWORDS,
+     "Log error message, %-formatting any extra args; exc_info=True appends the handled traceback"},
+    {"log_critical", py_log_critical, METH_VARARGS, "Log critical message, %-formatting any extra args"},
+    {"is_debug_enabled", py_is_debug_enabled, METH_NOARGS, "Whether debug messages are logged"},
 
     // Player functions
     {"get_player", py_get_player, METH_VARARGS, "Get player data"},
@@ -479,7 +625,12 @@ static PyMethodDef GameServerMethods[] = {
 
     // Event functions
     {"fire_event", py_fire_event, METH_VARARGS, "Fire game event"},
+    {"fire_events", py_fire_events, METH_VARARGS, "Fire a batch of (name, data) game events"},
     {"schedule_event", py_schedule_event, METH_VARARGS, "Schedule delayed event"},
+    {"register_spatial_trigger", py_register_spatial_trigger, METH_VARARGS,
+     "Fire player_entered_zone when a player moves within radius of a point"},
+    {"clear_spatial_triggers", py_clear_spatial_triggers, METH_NOARGS,
+     "Remove every registered spatial trigger"},
 
     // Utility functions
     {"get_current_time", py_get_current_time, METH_VARARGS, "Get current timestamp"},
@@ -683,6 +834,44 @@ void PythonAPI::FireEvent(const std::string& eventName, const nlohmann::json& da
     scripting.FireEvent(eventName, data);
 }
 
+void PythonAPI::FireEvents(const std::vector<std::pair<std::string, nlohmann::json>>& events) {
+    auto& scripting = PythonScripting::GetInstance();
+    for (const auto& [eventName, data] : events) {
+        scripting.FireEvent(eventName, data);
+    }
+}
+
+void PythonAPI::RegisterSpatialTrigger(const std::string& name, float x, float y, float z, float radius) {
+    std::unique_lock<std::shared_mutex> lock(spatialTriggersMutex);
+    // Re-registering a zone (e.g. on script reload) moves it instead of
+    // adding a second trigger under the same name
+    for (auto& trigger : spatialTriggers) {
+        if (trigger.name == name) {
+            trigger = {name, x, y, z, radius * radius};
+            return;
+        }
+    }
+    spatialTriggers.push_back({name, x, y, z, radius * radius});
+}
+
+void PythonAPI::ClearSpatialTriggers() {
+    std::unique_lock<std::shared_mutex> lock(spatialTriggersMutex);
+    spatialTriggers.clear();
+}
+
+std::string PythonAPI::FindSpatialTrigger(float x, float y, float z) {
+    std::shared_lock<std::shared_mutex> lock(spatialTriggersMutex);
+    for (const auto& trigger : spatialTriggers) {
+        float dx = trigger.x - x;
+        float dy = trigger.y - y;
+        float dz = trigger.z - z;
+        if (dx*dx + dy*dy + dz*dz <= trigger.radiusSq) {
+            return trigger.name;
+        }
+    }
+    return std::string();
+}
+
 void PythonAPI::ScheduleEvent(int delayMs, const std::string& eventName, const nlohmann::json& data) {
     std::thread([delayMs, eventName, data]() {
         std::this_thread::sleep_for(std::chrono::milliseconds(delayMs));
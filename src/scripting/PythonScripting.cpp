@@ -436,12 +436,19 @@ PyObject* PythonModule::JsonToPyObject(const nlohmann::json& json) {
     if (json.is_object()) {
         PyObject* dict = PyDict_New();
         for (const auto& [key, value] : json.items()) {
+            // Keys come from a small fixed vocabulary ("event", "data",
+            // "player_id", ...); interning them lets the handlers' literal
+            // subscripts match by identity instead of comparing characters
+            PyObject* pyKey = PyUnicode_InternFromString(key.c_str());
             PyObject* pyValue = JsonToPyObject(value);
-            if (!pyValue) {
+            if (!pyKey || !pyValue) {
+                Py_XDECREF(pyKey);
+                Py_XDECREF(pyValue);
                 Py_DECREF(dict);
                 return nullptr;
             }
-            PyDict_SetItemString(dict, key.c_str(), pyValue);
+            PyDict_SetItem(dict, pyKey, pyValue);
+            Py_DECREF(pyKey);
             Py_DECREF(pyValue);
         }
         return dict;
@@ -493,6 +500,7 @@ bool PythonModule::CheckPythonError() {
         PyObject* traceback;
 
         PyErr_Fetch(&type, &value, &traceback);
+        PyErr_NormalizeException(&type, &value, &traceback);
 
         std::string errorMsg;
         if (value) {
@@ -503,6 +511,24 @@ bool PythonModule::CheckPythonError() {
             errorMsg = "Unknown Python error";
         }
 
+        // Script handlers don't catch their own exceptions; this is the one
+        // place they are reported, so keep the full traceback
+        if (type && traceback) {
+            PyObjectRef tracebackModule(PyImport_ImportModule("traceback"));
+            if (tracebackModule) {
+                PyObjectRef lines(PyObject_CallMethod(tracebackModule.get(), "format_exception",
+                                                      "OOO", type, value ? value : Py_None, traceback));
+                PyObjectRef empty(PyUnicode_FromString(""));
+                if (lines && empty) {
+                    PyObjectRef joined(PyUnicode_Join(empty.get(), lines.get()));
+                    if (joined) {
+                        errorMsg = PyObjectToString(joined.get());
+                    }
+                }
+            }
+            PyErr_Clear();
+        }
+
         SetError(errorMsg);
 
         PyErr_Clear();